@@ -1,18 +1,37 @@
 # --- Imports ---
-import feedparser
 from datetime import datetime, timedelta, timezone
 from flask import Flask, request, render_template, jsonify
 import urllib.parse
-import unicodedata
-import ahocorasick
+import urllib.request
 import re
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
 import time
+import os
+import hashlib
+import threading
+import bisect
 from pathlib import Path
 from dataclasses import dataclass
+from contextvars import ContextVar
+from articles import Article, article_from_entry, decode_articles, decode_entities, encode_articles, encode_entities
+from archive import ArticleArchive, DEFAULT_RETENTION_HOURS
+from trends import TrendAggregator
+from normalization import normalize_name, normalize_team_name
+from lazy import Lazy
+from singleflight import SingleFlight
+from cache import CacheBackend, DEFAULT_MAX_BYTES, create_cache
+from profiling import init_profiling
+from scheduler import Overloaded, RoutePool, check_deadline, deadline_exceeded, init_scheduler, remaining_time, shed_response
+from shards import OTHER_LEAGUE, EntityShard, ShardedAutomaton, parse_league_selection, partition_aliases
+
+if TYPE_CHECKING:
+    import ahocorasick
 
 # --- Flask App Setup ---
 app = Flask(__name__)
+DEFAULT_WINDOW_HOURS = 48  # Standard search window; longer windows need the article archive
+# Point at a local stand-in (see news-stub.py) for load testing without hitting Google News
+NEWS_BASE_URL = os.environ.get("NEWS_BASE_URL", "https://news.google.com").rstrip("/")
 
 # --- Routes ---
 @app.route("/", methods=["GET"])
@@ -24,11 +43,11 @@ def autocomplete():
     query = request.args.get("query", "").strip().lower()
     suggestions = set()
     if query:
-        for norm_name, names in player_aliases.items():
+        for norm_name, names in get_player_aliases().items():
             for name in names:
                 if query in name.lower():
                     suggestions.add(name)
-        for norm_name, names in club_aliases.items():
+        for norm_name, names in get_club_aliases().items():
             for name in names:
                 if query in name.lower():
                     suggestions.add(name)
@@ -38,40 +57,31 @@ def autocomplete():
 def get_transfer_mentions():
     query = request.args.get("query", "").rstrip()
     search_type = request.args.get("type", "auto")  # Auto-detect by default
-    window = 48  # Standardized 48 hour window
+    window = parse_window_hours(request.args.get("window"))
 
     if not query:
         return render_error("Missing 'query' parameter")
 
-    try:
-        recent_articles = fetch_recent_articles(query, hours=window)
-    except Exception as e:
-        return render_template("home.html", error=f"Failed to fetch news: {str(e)}")
-
-    canonical_team = get_canonical_entity(query, club_aliases)
-    canonical_player = get_canonical_entity(query, player_aliases)
-
-    # Auto-detect search type if not specified
-    if search_type == "auto":
-        if canonical_player:
-            search_type = "player"
-        elif canonical_team:
-            search_type = "team"
-        else:
-            search_type = "player"  # Default to player when nothing found
+    search_type, canonical_team, canonical_player = resolve_search(query, search_type)
 
     if search_type == "team":
         if canonical_team:
             try:
-                player_article_links = get_entity_mentions(
-                    recent_articles, canonical_team, 'team', player_automaton, club_automaton
-                )
+                player_article_links = get_coalesced_mentions(query, canonical_team, 'team', window)
                 mentions_list = [
                     (player, len(links), f"/transfers/link?player={urllib.parse.quote(player)}&team={urllib.parse.quote(canonical_team)}")
-                    for player, links in sorted(player_article_links.items(), key=lambda x: len(x[1]), reverse=True)
+                    for player, links in sorted(
+                        player_article_links.items(),
+                        key=lambda x: (TRENDS.score("pair", (x[0], canonical_team)), len(x[1])),
+                        reverse=True,
+                    )
                 ]
                 context = build_team_context(canonical_team, mentions_list)
                 return render_template("team.html", **context)
+            except Overloaded as e:
+                return shed_response(e.retry_after)
+            except (NewsFetchError, TimeoutError) as e:
+                return render_template("home.html", error=f"Failed to fetch news: {str(e)}")
             except Exception as e:
                 import traceback
                 print("[ERROR] /transfers team block:", traceback.format_exc())
@@ -83,17 +93,22 @@ def get_transfer_mentions():
     else:  # search_type == "player" or anything else defaults to player
         if canonical_player:
             try:
+                club_article_map = get_coalesced_mentions(query, canonical_player, 'player', window)
                 player_info = get_player_info(canonical_player)
-                current_club = player_info.club if player_info else None
-                club_article_map = get_entity_mentions(
-                    recent_articles, canonical_player, 'player', player_automaton, club_automaton, exclude=current_club
-                )
                 linked_teams = [
                     (club, len(links), f"/transfers/link?player={urllib.parse.quote(canonical_player)}&team={urllib.parse.quote(club)}")
-                    for club, links in sorted(club_article_map.items(), key=lambda x: len(x[1]), reverse=True)
+                    for club, links in sorted(
+                        club_article_map.items(),
+                        key=lambda x: (TRENDS.score("pair", (canonical_player, x[0])), len(x[1])),
+                        reverse=True,
+                    )
                 ]
                 context = build_player_context(canonical_player, player_info, linked_teams)
                 return render_template("player.html", **context)
+            except Overloaded as e:
+                return shed_response(e.retry_after)
+            except (NewsFetchError, TimeoutError) as e:
+                return render_template("home.html", error=f"Failed to fetch news: {str(e)}")
             except Exception as e:
                 import traceback
                 print("[ERROR] /transfers player block:", traceback.format_exc())
@@ -107,52 +122,72 @@ def get_transfer_mentions():
 def transfers_link():
     player = request.args.get("player")
     team = request.args.get("team")
-    window = 48  # Standardized 48 hour window
+    window = parse_window_hours(request.args.get("window"))
     if not player or not team:
         return render_error("Missing player or team parameter")
     decoded_player = urllib.parse.unquote(player)
     decoded_team = urllib.parse.unquote(team)
-    canonical_player = get_canonical_entity(decoded_player, player_aliases)
-    canonical_team = get_canonical_entity(decoded_team, club_aliases)
+    canonical_player = get_canonical_entity(decoded_player, get_player_aliases())
+    canonical_team = get_canonical_entity(decoded_team, get_club_aliases())
     if not canonical_player or not canonical_team:
         return render_error("Player or team not found")
+    search_query = f"{decoded_player} {decoded_team}"
     try:
-        search_query = f"{decoded_player} {decoded_team}"
-        recent_articles = fetch_recent_articles(search_query, hours=window)
-    except Exception as e:
+        matching_articles = REQUEST_COALESCER.do(
+            coalesce_key((canonical_player, canonical_team), 'link', window),
+            lambda: filter_articles_with_entities(
+                fetch_for_mentions(search_query, canonical_player, window),
+                required_players=[canonical_player],
+                required_teams=[canonical_team],
+                player_automaton=get_player_automaton(),
+                club_automaton=get_club_automaton()
+            ),
+            timeout=coalesce_timeout(),
+            on_lead=SCHEDULER.claim_leader_slot,
+        )
+    except Overloaded as e:
+        return shed_response(e.retry_after)
+    except (NewsFetchError, TimeoutError) as e:
         return render_error(f"Failed to fetch news: {str(e)}")
-    matching_articles = filter_articles_with_entities(
-        recent_articles,
-        required_players=[canonical_player],
-        required_teams=[canonical_team],
-        player_automaton=player_automaton,
-        club_automaton=club_automaton
-    )
     context = build_transfer_link_context(canonical_player, canonical_team, matching_articles)
     return render_template("player.html", **context)
 
+@app.route("/trending", methods=["GET"])
+def trending():
+    """Hottest player/club rumors right now, ranked by decayed mention score"""
+    try:
+        k = max(1, min(int(request.args.get("k", 10)), 100))
+    except ValueError:
+        k = 10
+    rumors = []
+    for stats in TRENDS.top("pair", k):
+        player, team = stats.key
+        rumors.append({
+            "player": player,
+            "team": team,
+            "score": round(stats.score, 3),
+            "mentions_24h": stats.mentions_24h,
+            "velocity": round(stats.velocity, 3),
+            "link": f"/transfers/link?player={urllib.parse.quote(player)}&team={urllib.parse.quote(team)}",
+        })
+    return jsonify(rumors)
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return jsonify({
+        "coalescing": REQUEST_COALESCER.stats(),
+        "cache": get_cache().stats(),
+        "admission": SCHEDULER.stats(),
+        "shards": [shard.stats() for _, shard in sorted(get_shards().items())] if _shards.ready else None,
+    })
+
 @app.route("/team-stats", methods=["GET"])
 def team_stats_page():
     team_name = request.args.get("name")
     if not team_name:
         return render_error("Missing team name")
     decoded_team = urllib.parse.unquote(team_name)
-    team_players = get_players_for_team(decoded_team)
-    # --- TeamInfo ---
-    team_info = get_team_info(decoded_team)
-    # --- Team Stats ---
-    team_file = DATA_DIR / "team-stats.sql"
-    stat_keys = parse_sql_columns(str(team_file), "team_stats")
-    stats_row = find_sql_row_by_name(str(team_file), "team_stats", 2, decoded_team, normalize_team_name)
-    
-    team_stats = {}
-    if stats_row and stat_keys and len(stats_row) == len(stat_keys):
-        for key, value in zip(stat_keys, stats_row):
-            team_stats[key] = value
-    
-    context = build_team_roster_context(decoded_team, team_players)
-    context["team_info"] = team_info
-    context["team_stats"] = team_stats if team_stats else None
+    context = build_team_stats_context(decoded_team)
     return render_template("team-stats.html", **context)
 
 @app.route("/player-stats", methods=["GET"])
@@ -161,25 +196,14 @@ def player_stats_page():
     if not player_name:
         return render_error("Missing player parameter")
     decoded_player = urllib.parse.unquote(player_name)
-    canonical_player = get_canonical_entity(decoded_player, player_aliases)
+    canonical_player = get_canonical_entity(decoded_player, get_player_aliases())
     if not canonical_player:
         return render_error("Player not found")
     
     player_file = str(PLAYER_FILE)
     stat_keys = parse_sql_columns(player_file, "player_stats")
     stats_row = find_sql_row_by_name(player_file, "player_stats", 1, canonical_player)
-    
-    player_stats = {}
-    if stats_row and stat_keys and len(stats_row) == len(stat_keys):
-        excluded_keys = {'Rk', 'Player', 'Nation', 'Pos', 'Squad', 'Born', 'Matches'}
-        for key, value in zip(stat_keys, stats_row):
-            if key not in excluded_keys:
-                player_stats[key] = value
-    
-    player_info = get_player_info(canonical_player)
-    linked_teams = []
-    context = build_player_context(canonical_player, player_info, linked_teams, show_stats_link=False)
-    context["player_stats"] = player_stats
+    context = build_player_stats_context(canonical_player, stat_keys, stats_row)
     return render_template("player-stats.html", **context)
 
 # --- Data Loading and Helper Functions ---
@@ -198,17 +222,24 @@ class TeamInfo:
     country: str
     current_roster: str = ""
 
+def resolve_search(query: str, search_type: str) -> Tuple[str, Optional[str], Optional[str]]:
+    canonical_team = get_canonical_entity(query, get_club_aliases())
+    canonical_player = get_canonical_entity(query, get_player_aliases())
+
+    # Auto-detect search type if not specified
+    if search_type == "auto":
+        if canonical_player:
+            search_type = "player"
+        elif canonical_team:
+            search_type = "team"
+        else:
+            search_type = "player"  # Default to player when nothing found
+    return search_type, canonical_team, canonical_player
+
 def render_error(message, status=400):
     return render_template("home.html", error=message), status
 
 # --- SQL Parsing Helper Functions ---
-def normalize_team_name(s: str) -> str:
-    """Enhanced normalization for team names including common abbreviations"""
-    return ''.join(
-        c for c in unicodedata.normalize('NFD', s.lower()) 
-        if unicodedata.category(c) != 'Mn'
-    ).replace(' fc','').replace(' afc','').replace('.','').replace(',','').replace('-',' ').strip()
-
 def parse_sql_columns(file_path: str, table_name: str) -> List[str]:
     """Extract column names from SQL CREATE TABLE statement"""
     with open(file_path, encoding="utf-8") as f:
@@ -240,23 +271,94 @@ def find_sql_row_by_name(file_path: str, table_name: str, name_column_index: int
                 continue
             raw = match.group(1)
             values = split_sql_values(raw)
-            if len(values) > name_column_index:
-                norm_sql_name = normalize_func(values[name_column_index])
-                # Allow exact or partial match
-                if (norm_target == norm_sql_name or 
-                    norm_target in norm_sql_name or 
-                    norm_sql_name in norm_target):
-                    return values
+            if row_name_matches(values, name_column_index, norm_target, normalize_func):
+                return values
+    return None
+
+def row_name_matches(values: List[str], name_column_index: int, norm_target: str, normalize_func) -> bool:
+    if len(values) <= name_column_index:
+        return False
+    norm_sql_name = normalize_func(values[name_column_index])
+    # Allow exact or partial match
+    return (norm_target == norm_sql_name or
+            norm_target in norm_sql_name or
+            norm_sql_name in norm_target)
+
+def match_row_by_name(rows: List[List[str]], name_column_index: int, target_name: str,
+                      normalize_func=None) -> Optional[List[str]]:
+    """Same matching as find_sql_row_by_name, over rows already loaded with load_sql_table"""
+    if normalize_func is None:
+        normalize_func = normalize_name
+    norm_target = normalize_func(target_name)
+    for values in rows:
+        if row_name_matches(values, name_column_index, norm_target, normalize_func):
+            return values
     return None
 
+class SqlRowIndex:
+    """Answers match_row_by_name for many targets without rescanning every row each time"""
+
+    def __init__(self, rows: List[List[str]], name_column_index: int, normalize_func=None):
+        self.rows = rows
+        self.normalize_func = normalize_func or normalize_name
+        names = [
+            self.normalize_func(values[name_column_index]) if len(values) > name_column_index else None
+            for values in rows
+        ]
+        # First row index for each exact name, plus all names joined for substring search
+        self._first_by_name: Dict[str, int] = {}
+        self._starts: List[int] = []
+        self._row_of_start: List[int] = []
+        parts, offset = [], 0
+        for i, name in enumerate(names):
+            if name is None:
+                continue
+            self._first_by_name.setdefault(name, i)
+            self._starts.append(offset)
+            self._row_of_start.append(i)
+            parts.append(name)
+            offset += len(name) + 1
+        self._joined = "\n".join(parts)
+
+    def match(self, target_name: str) -> Optional[List[str]]:
+        norm_target = self.normalize_func(target_name)
+        best = len(self.rows)
+        # Rows whose name contains the target (includes exact matches): first occurrence wins
+        pos = self._joined.find(norm_target)
+        while pos != -1:
+            i = self._row_of_start[bisect.bisect_right(self._starts, pos) - 1]
+            line_end = self._joined.find("\n", pos)
+            if line_end == -1 or pos + len(norm_target) <= line_end:
+                best = i
+                break
+            pos = self._joined.find(norm_target, pos + 1)
+        # Rows whose name is contained in the target
+        for start in range(len(norm_target) + 1):
+            for end in range(start, len(norm_target) + 1):
+                i = self._first_by_name.get(norm_target[start:end])
+                if i is not None and i < best:
+                    best = i
+        return self.rows[best] if best < len(self.rows) else None
+
+def load_sql_table(file_path: str, table_name: str) -> Tuple[List[str], List[List[str]]]:
+    """Parse a whole SQL dump into its column names and value rows"""
+    insert_re = re.compile(rf"INSERT INTO {table_name} VALUES \((.*?)\);", re.IGNORECASE)
+    rows = []
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            match = insert_re.match(line.strip())
+            if match:
+                rows.append(split_sql_values(match.group(1)))
+    return parse_sql_columns(file_path, table_name), rows
+
 def get_player_info(canonical_player: str) -> 'PlayerInfo|None':
     if not canonical_player:
         return None
-    return PLAYER_LOOKUP.get(canonical_player.lower())
+    return get_player_lookup().get(canonical_player.lower())
 
 def get_players_for_team(team_name: str) -> list[dict]:
     players = []
-    for player_info in PLAYER_LOOKUP.values():
+    for player_info in get_player_lookup().values():
         if player_info.club.lower() == team_name.lower():
             age = calculate_age_from_birth_year(player_info.born)
             nationality_full = convert_nationality_to_full_name(player_info.nationality)
@@ -314,6 +416,38 @@ def build_team_roster_context(decoded_team, team_players):
         context["no_mentions_message"] = "No players found for this team."
     return context
 
+def build_team_stats_context(decoded_team):
+    team_players = get_players_for_team(decoded_team)
+    # --- TeamInfo ---
+    team_info = get_team_info(decoded_team)
+    # --- Team Stats ---
+    stat_keys, team_rows = get_team_stats_table()
+    stats_row = match_row_by_name(team_rows, 2, decoded_team, normalize_team_name)
+    
+    team_stats = {}
+    if stats_row and stat_keys and len(stats_row) == len(stat_keys):
+        for key, value in zip(stat_keys, stats_row):
+            team_stats[key] = value
+    
+    context = build_team_roster_context(decoded_team, team_players)
+    context["team_info"] = team_info
+    context["team_stats"] = team_stats if team_stats else None
+    return context
+
+def build_player_stats_context(canonical_player, stat_keys, stats_row):
+    player_stats = {}
+    if stats_row and stat_keys and len(stats_row) == len(stat_keys):
+        excluded_keys = {'Rk', 'Player', 'Nation', 'Pos', 'Squad', 'Born', 'Matches'}
+        for key, value in zip(stat_keys, stats_row):
+            if key not in excluded_keys:
+                player_stats[key] = value
+    
+    player_info = get_player_info(canonical_player)
+    linked_teams = []
+    context = build_player_context(canonical_player, player_info, linked_teams, show_stats_link=False)
+    context["player_stats"] = player_stats
+    return context
+
 def build_transfer_link_context(canonical_player, canonical_team, matching_articles):
     player_link = f'<a href="/transfers?query={urllib.parse.quote(canonical_player)}&type=player" class="results-header-link">{canonical_player.title()}</a>'
     team_link = f'<a href="/transfers?query={urllib.parse.quote(canonical_team)}&type=team" class="results-header-link">{canonical_team.title()}</a>'
@@ -356,15 +490,194 @@ def build_player_info_block(player_info, canonical_player, show_stats_link=True)
         )
 
 def extract_entities(entry, player_automaton, club_automaton):
+    # Articles annotated at ingest (or loaded from the archive) carry their entities already
+    if getattr(entry, "players", None) is not None and getattr(entry, "teams", None) is not None:
+        return set(entry.players), set(entry.teams)
     text = (entry.title or "") + " " + (entry.get("description") or "")
+    cache_key = ENTITY_CACHE_PREFIX + hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    cached = get_cache().get(cache_key)
+    if cached is not None:
+        decoded = decode_entities(cached)
+        if decoded is not None:
+            return decoded
     found_players = find_entities(text, player_automaton)
     found_teams = find_entities(text, club_automaton)
+    get_cache().set(cache_key, encode_entities(found_players, found_teams), ttl=ENTITY_CACHE_TTL)
     return found_players, found_teams
 
+class NewsFetchError(Exception):
+    """The upstream news source could not be read"""
+
+def fetch_for_mentions(query: str, entity: str, window: int) -> List[Article]:
+    try:
+        return collect_articles(query, hours=window, entity=entity)
+    except Exception as e:
+        raise NewsFetchError(str(e)) from e
+
+def get_coalesced_mentions(query: str, canonical_entity: str, entity_type: str, window: int) -> Dict[str, Set[str]]:
+    """get_entity_mentions over freshly collected articles, shared by concurrent identical searches"""
+    def compute():
+        recent_articles = fetch_for_mentions(query, canonical_entity, window)
+        exclude = None
+        if entity_type == 'player':
+            player_info = get_player_info(canonical_entity)
+            exclude = player_info.club if player_info else None
+        return get_entity_mentions(
+            recent_articles, canonical_entity, entity_type, get_player_automaton(), get_club_automaton(), exclude=exclude
+        )
+    return REQUEST_COALESCER.do(coalesce_key(canonical_entity, entity_type, window), compute,
+                               timeout=coalesce_timeout(), on_lead=SCHEDULER.claim_leader_slot)
+
+def coalesce_key(canonical_entity: Any, entity_type: str, window: int) -> Tuple:
+    """Single-flight key shared by identical /transfers ('team'/'player') and /transfers/link ('link') requests"""
+    return (canonical_entity, entity_type, window)
+
+def coalesce_timeout() -> float:
+    """How long to wait on another request's fetch: COALESCE_TIMEOUT, capped by our own deadline"""
+    remaining = remaining_time()
+    return COALESCE_TIMEOUT if remaining is None else max(0.0, min(COALESCE_TIMEOUT, remaining))
+
+def build_feed_url(query: str) -> str:
+    return f"{NEWS_BASE_URL}/rss/search?q={query.replace(' ', '+')}"
+
+def get_cached_feed(rss_url: str) -> Optional[List[Article]]:
+    cached = get_cache().get("feed:" + rss_url)
+    return decode_articles(cached) if cached is not None else None
+
+def parse_feed(rss_url: str, source: Any, response_headers: Optional[Dict[str, str]] = None) -> List[Article]:
+    """Parse a feed (URL or already-downloaded content) into Articles and cache them under rss_url"""
+    import feedparser  # Deferred: only news routes pay for it
+    feed = feedparser.parse(source, response_headers=response_headers)
+    articles = [a for a in (article_from_entry(e) for e in feed.entries) if a is not None]
+    if articles or not feed.get("bozo"):
+        get_cache().set("feed:" + rss_url, encode_articles(articles), ttl=FEED_CACHE_TTL)
+    return articles
+
 def fetch_recent_articles(query: str, hours: int = 24):
-    rss_url = f"https://news.google.com/rss/search?q={query.replace(' ', '+')}"
-    feed = feedparser.parse(rss_url)
-    return filter_recent_articles(feed.entries, hours=hours)
+    rss_url = build_feed_url(query)
+    # The ASGI front-end (asgi.py) downloads feeds on its event loop and hands them over here
+    articles = (_prefetched_feeds.get() or {}).get(rss_url)
+    if isinstance(articles, Exception):
+        raise articles
+    if articles is None:
+        articles = get_cached_feed(rss_url)
+    if articles is None:
+        content, headers = download_feed(rss_url)
+        articles = parse_feed(rss_url, content, response_headers=headers)
+    return filter_recent_articles(articles, hours=hours)
+
+def download_feed(rss_url: str) -> Tuple[bytes, Dict[str, str]]:
+    """GET rss_url, abandoning it once the request's deadline (or FEED_FETCH_TIMEOUT) has passed"""
+    import feedparser
+    budget = check_deadline(MIN_FETCH_BUDGET)
+    timeout = FEED_FETCH_TIMEOUT if budget is None else min(budget, FEED_FETCH_TIMEOUT)
+    give_up = time.monotonic() + timeout
+    req = urllib.request.Request(rss_url, headers={"User-Agent": feedparser.USER_AGENT})
+    chunks = []
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            headers = {k.lower(): v for k, v in response.headers.items()}
+            while True:
+                chunk = response.read(64 * 1024)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if time.monotonic() > give_up:
+                    raise TimeoutError(f"download still running after {timeout:.2f}s")
+    except OSError as e:
+        if budget is not None and time.monotonic() >= give_up:
+            raise deadline_exceeded(f"Feed fetch abandoned at request deadline: {e}") from e
+        raise
+    return b"".join(chunks), headers
+
+def news_request_target(path: str, args: Dict[str, str]) -> Optional[Tuple[str, Hashable]]:
+    """(news query, coalesce_key) of a /transfers or /transfers/link request, or None if it fetches nothing"""
+    window = parse_window_hours(args.get("window"))
+    if path == "/transfers":
+        query = args.get("query", "").rstrip()
+        if not query:
+            return None
+        search_type, canonical_team, canonical_player = resolve_search(query, args.get("type", "auto"))
+        if search_type == "team":
+            return (query, coalesce_key(canonical_team, 'team', window)) if canonical_team else None
+        return (query, coalesce_key(canonical_player, 'player', window)) if canonical_player else None
+    if path == "/transfers/link":
+        player, team = args.get("player"), args.get("team")
+        if not player or not team:
+            return None
+        decoded_player = urllib.parse.unquote(player)
+        decoded_team = urllib.parse.unquote(team)
+        canonical_player = get_canonical_entity(decoded_player, get_player_aliases())
+        canonical_team = get_canonical_entity(decoded_team, get_club_aliases())
+        if not canonical_player or not canonical_team:
+            return None
+        return f"{decoded_player} {decoded_team}", coalesce_key((canonical_player, canonical_team), 'link', window)
+    return None
+
+def feed_query_for_request(path: str, args: Dict[str, str]) -> Optional[str]:
+    """The news query a /transfers or /transfers/link request will fetch, or None if it fetches nothing"""
+    target = news_request_target(path, args)
+    return target[0] if target else None
+
+def parse_window_hours(raw: Optional[str]) -> int:
+    """Parse a window like '48', '24h' or '7d' into hours, clamped to the archive retention"""
+    if not raw:
+        return DEFAULT_WINDOW_HOURS
+    raw = raw.strip().lower()
+    try:
+        if raw.endswith("d"):
+            hours = int(raw[:-1]) * 24
+        else:
+            hours = int(raw.rstrip("h"))
+    except ValueError:
+        return DEFAULT_WINDOW_HOURS
+    return max(1, min(hours, MAX_WINDOW_HOURS))
+
+def ingest_articles(articles: List[Article]) -> None:
+    """Annotate fetched articles with their entities, feed the trend aggregates and archive them"""
+    for article in articles:
+        if article.players is None or article.teams is None:
+            found_players, found_teams = extract_entities(article, get_player_automaton(), get_club_automaton())
+            article.players = sorted(found_players)
+            article.teams = sorted(found_teams)
+    TRENDS.ingest(articles)
+    if ARCHIVE is None:
+        return
+    ARCHIVE.append(articles)
+    maintain_archive_in_background()
+
+def maintain_archive_in_background() -> None:
+    """Start hourly retention + compaction on a daemon thread, never in the request that triggers it"""
+    global _last_archive_maintenance
+    if time.time() - _last_archive_maintenance < ARCHIVE_MAINTENANCE_INTERVAL:
+        return
+    if not _archive_maintenance_lock.acquire(blocking=False):
+        return  # Already running
+    _last_archive_maintenance = time.time()
+
+    def run():
+        try:
+            ARCHIVE.maintain()
+        except Exception:
+            import traceback
+            print("[ERROR] archive maintenance:", traceback.format_exc())
+        finally:
+            _archive_maintenance_lock.release()
+
+    threading.Thread(target=run, name="archive-maintenance", daemon=True).start()
+
+def collect_articles(query: str, hours: int = DEFAULT_WINDOW_HOURS, entity: Optional[str] = None) -> List[Article]:
+    """Fetch live articles and, when archiving is enabled, merge in archived ones mentioning entity"""
+    articles = fetch_recent_articles(query, hours=hours)
+    ingest_articles(articles)
+    if ARCHIVE is None or entity is None:
+        return articles
+    seen_links = {a.link for a in articles}
+    for archived in ARCHIVE.query(hours, entity=entity):
+        if archived.link not in seen_links:
+            articles.append(archived)
+            seen_links.add(archived.link)
+    return articles
 
 def build_team_context(canonical_team, mentions_list):
     header = f'{canonical_team.title()} trending mentions'
@@ -384,9 +697,8 @@ def build_team_context(canonical_team, mentions_list):
     return context
 
 def get_team_info(canonical_team: str) -> 'TeamInfo|None':
-    # Load from team-stats.sql (simple parse, not efficient for large files)
-    team_file = DATA_DIR / "team-stats.sql"
-    stats_row = find_sql_row_by_name(str(team_file), "team_stats", 2, canonical_team, normalize_team_name)
+    _, team_rows = get_team_stats_table()
+    stats_row = match_row_by_name(team_rows, 2, canonical_team, normalize_team_name)
     
     if stats_row and len(stats_row) >= 3:
         league = stats_row[0] if stats_row else "Unknown"
@@ -446,12 +758,6 @@ def build_player_context_for_unknown(query):
     )
     return context
 
-def normalize_name(s: str) -> str:
-    return ''.join(
-        c for c in unicodedata.normalize('NFD', s.lower())
-        if unicodedata.category(c) != 'Mn'
-    )
-
 def convert_nationality_to_full_name(nationality_code: str) -> str:
     """Convert nationality codes like 'esESP' to full country names like 'Spanish'"""
     nationality_mapping = {
@@ -573,7 +879,7 @@ def calculate_age_from_birth_year(birth_year: str) -> str:
     except (ValueError, TypeError):
         return "Unknown"
 
-def load_player_data(filename: str) -> Tuple[Dict[str, List[str]], Dict[str, List[str]], Dict[str, PlayerInfo]]:
+def load_player_data(filename: str, include_club: Optional[Callable[[str], bool]] = None) -> Tuple[Dict[str, List[str]], Dict[str, List[str]], Dict[str, PlayerInfo]]:
     player_aliases: Dict[str, List[str]] = {}
     club_aliases: Dict[str, List[str]] = {}
     player_lookup: Dict[str, PlayerInfo] = {}
@@ -593,6 +899,8 @@ def load_player_data(filename: str) -> Tuple[Dict[str, List[str]], Dict[str, Lis
             position = values[3] if values[3] else "Unknown"
             club = values[4] if values[4] else "Unknown"
             born = values[6] if len(values) > 6 and values[6] else "Unknown"
+            if include_club is not None and not include_club(club):
+                continue
             norm_name = normalize_name(name)
             player_aliases.setdefault(norm_name, []).append(name)
             player_lookup[name.lower()] = PlayerInfo(name, born, position, club, nationality)
@@ -612,7 +920,8 @@ def add_aliases(aliases_dict: Dict[str, List[str]], replacements: list[tuple[str
     aliases_dict.update(new_aliases)
     return aliases_dict
 
-def build_automaton(aliases_dict: Dict[str, List[str]]) -> ahocorasick.Automaton:
+def build_automaton(aliases_dict: Dict[str, List[str]]) -> 'ahocorasick.Automaton':
+    import ahocorasick
     A = ahocorasick.Automaton()
     for norm_alias in aliases_dict:
         # Store both the canonical name and the alias length for boundary checking
@@ -620,7 +929,7 @@ def build_automaton(aliases_dict: Dict[str, List[str]]) -> ahocorasick.Automaton
     A.make_automaton()
     return A
 
-def find_entities(text: str, automaton: ahocorasick.Automaton) -> Set[str]:
+def find_entities(text: str, automaton: 'ahocorasick.Automaton') -> Set[str]:
     norm_text = normalize_name(text)
     raw_matches: List[Tuple[int, int, str, int]] = []  # (start, end, canon, length)
     for end_index, (canon, alias_length) in automaton.iter(norm_text):
@@ -665,16 +974,179 @@ def get_canonical_entity(user_input: str, aliases: Dict[str, List[str]]) -> Opti
 # --- Data Loading ---
 DATA_DIR = Path(__file__).parent
 PLAYER_FILE = DATA_DIR / "player-stats.sql"
-player_aliases, club_aliases, PLAYER_LOOKUP = load_player_data(str(PLAYER_FILE))
-club_aliases = add_aliases(club_aliases, [
+TEAM_FILE = DATA_DIR / "team-stats.sql"
+CLUB_ALIAS_REPLACEMENTS = [
     ("utd", "united"), ("united", "utd"),
     ("manchester united", "man united"), ("man united", "manchester united"),
     ("manchester city", "man city"), ("man city", "manchester city"),
     ("man united", "man u"), ("man u", "man united"),
     ("nott'ham forest", "nottingham forest"), ("nottingham forest", "nott'ham forest")
-])
-player_automaton = build_automaton(player_aliases)
-club_automaton = build_automaton(club_aliases)
+]
+
+# Each dataset is built on first use so cold starts serving "/" or static files skip it.
+# Set EAGER_INIT=1 (or call warm_up()) on long-running servers to pay the cost up front.
+# LEAGUE_SHARDS limits loaded players/clubs to some leagues (e.g. "Premier League,La Liga";
+# "Other" covers clubs missing from team-stats.sql). Unset loads every shard.
+LOADED_LEAGUES = parse_league_selection(os.environ.get("LEAGUE_SHARDS"))
+
+def build_league_map(team_rows: List[List[str]]) -> Dict[str, str]:
+    """Normalized Squad name -> League, from team-stats.sql"""
+    return {normalize_team_name(row[2]): row[0] for row in team_rows if len(row) > 2}
+
+def get_club_league(club: str) -> str:
+    return _league_map.get().get(normalize_team_name(club), OTHER_LEAGUE)
+
+def is_loaded_club(club: str) -> bool:
+    return LOADED_LEAGUES is None or get_club_league(club) in LOADED_LEAGUES
+
+def build_shards() -> Dict[str, EntityShard]:
+    lookup = get_player_lookup()
+    shards: Dict[str, EntityShard] = {}
+
+    def player_league(name: str) -> str:
+        info = lookup.get(name.lower())
+        return get_club_league(info.club) if info else OTHER_LEAGUE
+
+    partition_aliases(get_player_aliases(), player_league, shards, "player")
+    partition_aliases(get_club_aliases(), get_club_league, shards, "club")
+    for shard in shards.values():
+        shard.player_automaton = build_automaton(shard.player_aliases) if shard.player_aliases else None
+        shard.club_automaton = build_automaton(shard.club_aliases) if shard.club_aliases else None
+    return shards
+
+def build_sharded_automata() -> Tuple[ShardedAutomaton, ShardedAutomaton]:
+    shards = [_shards.get()[league] for league in sorted(_shards.get())]
+    return (ShardedAutomaton(s.player_automaton for s in shards),
+            ShardedAutomaton(s.club_automaton for s in shards))
+
+_team_stats_table = Lazy(lambda: load_sql_table(str(TEAM_FILE), "team_stats"))
+_league_map = Lazy(lambda: build_league_map(get_team_stats_table()[1]))
+_player_data = Lazy(lambda: load_player_data(
+    str(PLAYER_FILE), include_club=None if LOADED_LEAGUES is None else is_loaded_club
+))
+_club_aliases = Lazy(lambda: add_aliases(_player_data.get()[1], CLUB_ALIAS_REPLACEMENTS))
+_shards = Lazy(build_shards)
+_automata = Lazy(build_sharded_automata)
+
+def get_player_aliases() -> Dict[str, List[str]]:
+    return _player_data.get()[0]
+
+def get_player_lookup() -> Dict[str, PlayerInfo]:
+    return _player_data.get()[2]
+
+def get_club_aliases() -> Dict[str, List[str]]:
+    return _club_aliases.get()
+
+def get_player_automaton() -> ShardedAutomaton:
+    return _automata.get()[0]
+
+def get_club_automaton() -> ShardedAutomaton:
+    return _automata.get()[1]
+
+def get_shards() -> Dict[str, EntityShard]:
+    return _shards.get()
+
+def get_team_stats_table() -> Tuple[List[str], List[List[str]]]:
+    return _team_stats_table.get()
+
+def warm_up() -> None:
+    """Build every lazy dataset and import deferred modules (for platforms with a warm-up phase)"""
+    import feedparser  # noqa: F401
+    get_player_lookup()
+    get_club_aliases()
+    get_player_automaton()
+    get_team_stats_table()
+
+# --- Article Archive ---
+# Google News only returns a recent slice, so windows beyond ~48h rely on the archive.
+# Set ARTICLE_ARCHIVE_DIR to a writable path (e.g. /tmp/scotbot-archive on Vercel) to enable it.
+ARCHIVE_DIR = os.environ.get("ARTICLE_ARCHIVE_DIR")
+ARCHIVE_RETENTION_HOURS = int(os.environ.get("ARTICLE_ARCHIVE_RETENTION_HOURS", DEFAULT_RETENTION_HOURS))
+MAX_WINDOW_HOURS = ARCHIVE_RETENTION_HOURS if ARCHIVE_DIR else DEFAULT_WINDOW_HOURS
+ARCHIVE = ArticleArchive(ARCHIVE_DIR, retention_hours=ARCHIVE_RETENTION_HOURS) if ARCHIVE_DIR else None
+ARCHIVE_MAINTENANCE_INTERVAL = 3600
+_last_archive_maintenance = 0.0
+_archive_maintenance_lock = threading.Lock()  # Held for the duration of a background maintenance run
+
+# --- Upstream Fetching ---
+FEED_FETCH_TIMEOUT = float(os.environ.get("FEED_FETCH_TIMEOUT", 15))
+MIN_FETCH_BUDGET = 0.5  # Don't start a feed download with less of the request deadline left than this
+
+# --- Trend Aggregates ---
+TRENDS = TrendAggregator()
+
+# --- Feed Prefetching ---
+# Set (per request context) by asgi.py to {rss_url: [Article, ...]} fetched asynchronously,
+# or {rss_url: NewsFetchError} when that fetch failed
+_prefetched_feeds: ContextVar[Optional[Dict[str, Any]]] = ContextVar("prefetched_feeds", default=None)
+
+# --- Shared Cache ---
+# "memory" caches per worker; "sqlite" shares one WAL-mode file between all workers on the host
+FEED_CACHE_TTL = float(os.environ.get("FEED_CACHE_TTL", 300))
+ENTITY_CACHE_TTL = float(os.environ.get("ENTITY_CACHE_TTL", 24 * 3600))
+# Extraction results depend on which league shards are loaded, so keep them apart in shared caches
+ENTITY_CACHE_PREFIX = "entities:" + ",".join(sorted(LOADED_LEAGUES or ["*"])) + ":"
+_cache = Lazy(lambda: create_cache(
+    os.environ.get("CACHE_BACKEND", "memory"),
+    path=os.environ.get("CACHE_PATH"),
+    max_bytes=int(os.environ.get("CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+))
+
+def get_cache() -> CacheBackend:
+    return _cache.get()
+
+# --- Request Coalescing ---
+# Concurrent /transfers searches for the same entity and window share one fetch + extraction
+COALESCE_TIMEOUT = float(os.environ.get("COALESCE_TIMEOUT", 30))
+REQUEST_COALESCER = SingleFlight()
+
+# --- Admission Control ---
+# Separate pools keep slow news searches from starving keystroke-driven autocomplete; see scheduler.py.
+# Under threaded WSGI servers keep NEWS_CONCURRENCY + NEWS_QUEUE below the worker's thread count,
+# since queued requests hold a thread while they wait. Searches that would only wait on an identical
+# in-flight fetch (see REQUEST_COALESCER) go to the cheap "news_followers" pool instead of being shed;
+# one that finds the fetch already finished must take a "news" slot to redo it (claim_leader_slot).
+ROUTE_CLASSES = {
+    "/transfers": "news",
+    "/transfers/link": "news",
+    "/": "interactive",
+    "/autocomplete": "interactive",
+    "/trending": "interactive",
+    "/team-stats": "pages",
+    "/player-stats": "pages",
+}
+
+def classify_request(path: str, args: Dict[str, str]) -> Optional[str]:
+    route_class = ROUTE_CLASSES.get(path)
+    if route_class == "news":
+        target = news_request_target(path, args)
+        if target is not None and REQUEST_COALESCER.in_flight(target[1]):
+            return "news_followers"
+    return route_class
+
+SCHEDULER = init_scheduler(
+    app,
+    [
+        RoutePool.from_env("news", concurrency=4, queue_size=2, max_wait=5.0, deadline=20.0),
+        RoutePool.from_env("news_followers", concurrency=32, queue_size=0, max_wait=0.0, deadline=20.0),
+        RoutePool.from_env("interactive", concurrency=16, queue_size=32, max_wait=1.0, deadline=2.0),
+        RoutePool.from_env("pages", concurrency=4, queue_size=8, max_wait=5.0, deadline=10.0),
+    ],
+    classify=classify_request,
+    leader_pools={"news_followers": "news"},
+    enabled=os.environ.get("ADMISSION_CONTROL", "1") != "0",
+)
+
+# --- Profiling ---
+# Disabled unless PROFILING_TOKEN is set; see profiling.py for the /_profile endpoints
+PROFILER = init_profiling(
+    app,
+    token=os.environ.get("PROFILING_TOKEN"),
+    sample_rate=float(os.environ.get("PROFILE_SAMPLE_RATE", 1.0)),
+)
+
+if os.environ.get("EAGER_INIT") == "1":
+    warm_up()
 
 # Export for WSGI deployment (Vercel, etc.)
 application = app
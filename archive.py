@@ -0,0 +1,247 @@
+import json
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from articles import Article
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms fall back to the in-process lock only
+    fcntl = None
+
+# --- Article Archive ---
+# Append-only, hour-bucketed article log. Every bucket is a pair of files:
+#   <key>.log  one JSON article per line, never rewritten except by compaction
+#   <key>.idx  JSON index {"links": {link: offset}, "entities": {name: [offsets]}}
+# Hour buckets are keyed "h-YYYYMMDDHH"; compaction folds a finished day of hour
+# buckets into a single "d-YYYYMMDD" bucket so long windows touch fewer files.
+
+HOUR = 3600
+DAY = 24 * HOUR
+DEFAULT_RETENTION_HOURS = 30 * 24
+DEFAULT_COMPACT_AFTER_HOURS = 48
+MAX_CACHED_SEGMENTS = 64  # Parsed indexes kept per process; older ones are reloaded from disk when queried
+
+def hour_key(ts: float) -> str:
+    return "h-" + datetime.fromtimestamp(ts, timezone.utc).strftime("%Y%m%d%H")
+
+def day_key(ts: float) -> str:
+    return "d-" + datetime.fromtimestamp(ts, timezone.utc).strftime("%Y%m%d")
+
+def key_start(key: str) -> float:
+    """UTC epoch seconds at which a bucket starts"""
+    fmt = "%Y%m%d%H" if key.startswith("h-") else "%Y%m%d"
+    return datetime.strptime(key[2:], fmt).replace(tzinfo=timezone.utc).timestamp()
+
+def key_end(key: str) -> float:
+    return key_start(key) + (HOUR if key.startswith("h-") else DAY)
+
+class Segment:
+    """One bucket of the archive: an append-only log plus its entity index"""
+
+    def __init__(self, root: Path, key: str):
+        self.key = key
+        self.log_path = root / f"{key}.log"
+        self.idx_path = root / f"{key}.idx"
+        self._index: Optional[Dict] = None
+        self._index_mtime = 0.0
+
+    @property
+    def index(self) -> Dict:
+        # Other workers may have appended since we last looked; reload on change
+        try:
+            mtime = self.idx_path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = 0.0
+        if self._index is None or mtime != self._index_mtime:
+            if mtime:
+                with open(self.idx_path, encoding="utf-8") as f:
+                    self._index = json.load(f)
+            else:
+                self._index = {"links": {}, "entities": {}}
+            self._index_mtime = mtime
+        return self._index
+
+    def append(self, articles: Iterable[Article]) -> List[Article]:
+        # Build the new index on the side and publish it only once the log lines it points
+        # at are on disk, so concurrent readers never see offsets past the end of the log
+        index = self.index
+        links = dict(index["links"])
+        entities = dict(index["entities"])
+        copied = set()
+        added = []
+        with open(self.log_path, "ab") as f:
+            for article in articles:
+                if not article.link or article.link in links:
+                    continue
+                offset = f.tell()
+                f.write(json.dumps(article.to_dict(), ensure_ascii=False).encode("utf-8") + b"\n")
+                links[article.link] = offset
+                for name in set(article.players or []) | set(article.teams or []):
+                    if name not in copied:
+                        entities[name] = list(entities.get(name, []))
+                        copied.add(name)
+                    entities[name].append(offset)
+                added.append(article)
+        if added:
+            self._write_index({"links": links, "entities": entities})
+        return added
+
+    def _write_index(self, index: Dict) -> None:
+        tmp_path = self.idx_path.with_suffix(".idx.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.idx_path)
+        self._index, self._index_mtime = index, self.idx_path.stat().st_mtime
+
+    def read(self, offsets: Optional[List[int]] = None) -> Iterator[Article]:
+        """Yield articles from the memory-mapped log, either all of them or only those at offsets"""
+        try:
+            f = open(self.log_path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if offsets is None:
+                    for line in iter(mm.readline, b""):
+                        yield Article.from_dict(json.loads(line))
+                else:
+                    for offset in sorted(offsets):
+                        end = mm.find(b"\n", offset)
+                        yield Article.from_dict(json.loads(mm[offset:end if end != -1 else len(mm)]))
+
+    def remove(self) -> None:
+        for path in (self.log_path, self.idx_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+class ArticleArchive:
+    """Persistent article store answering windowed, optionally entity-filtered queries"""
+
+    def __init__(self, root: str, retention_hours: int = DEFAULT_RETENTION_HOURS,
+                 compact_after_hours: int = DEFAULT_COMPACT_AFTER_HOURS):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.retention_hours = retention_hours
+        self.compact_after_hours = compact_after_hours
+        self._segments: "OrderedDict[str, Segment]" = OrderedDict()  # LRU of recently used buckets
+        self._segments_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _write_lock(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.root / ".lock", "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _segment(self, key: str) -> Segment:
+        with self._segments_lock:
+            segment = self._segments.get(key)
+            if segment is None:
+                segment = self._segments[key] = Segment(self.root, key)
+                while len(self._segments) > MAX_CACHED_SEGMENTS:
+                    self._segments.popitem(last=False)
+            else:
+                self._segments.move_to_end(key)
+            return segment
+
+    def _forget(self, key: str) -> None:
+        with self._segments_lock:
+            self._segments.pop(key, None)
+
+    def _existing_keys(self) -> List[str]:
+        return sorted(p.stem for p in self.root.glob("[hd]-*.log"))
+
+    def append(self, articles: Iterable[Article]) -> List[Article]:
+        """Store articles in their hour bucket (or compacted day bucket); returns the ones not seen before"""
+        buckets: Dict[str, List[Article]] = {}
+        with self._write_lock():
+            existing = set(self._existing_keys())
+            for article in articles:
+                key = day_key(article.published)
+                if key not in existing:
+                    key = hour_key(article.published)
+                buckets.setdefault(key, []).append(article)
+            added: List[Article] = []
+            for key, items in buckets.items():
+                added.extend(self._segment(key).append(items))
+        return added
+
+    def query(self, hours: float, entity: Optional[str] = None, now: Optional[float] = None) -> List[Article]:
+        """Return archived articles published in the last `hours`, reading only the overlapping buckets"""
+        now = time.time() if now is None else now
+        start = now - hours * HOUR
+        results = []
+        for key in self._existing_keys():
+            if key_end(key) <= start or key_start(key) > now:
+                continue
+            segment = self._segment(key)
+            if entity is None:
+                articles = segment.read()
+            else:
+                offsets = segment.index["entities"].get(entity)
+                if not offsets:
+                    continue
+                articles = segment.read(offsets)
+            results.extend(a for a in articles if start < a.published <= now)
+        return results
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """Fold complete days of hour buckets older than compact_after_hours into day buckets"""
+        now = time.time() if now is None else now
+        cutoff = now - self.compact_after_hours * HOUR
+        by_day: Dict[str, List[str]] = {}
+        for key in self._existing_keys():
+            if key.startswith("h-"):
+                by_day.setdefault(day_key(key_start(key)), []).append(key)
+        compacted = 0
+        for dkey, hour_keys in by_day.items():
+            if key_end(dkey) > cutoff:
+                continue
+            # Lock per day so appends from other workers wait for one day's fold, not all of them
+            with self._write_lock():
+                day_segment = self._segment(dkey)
+                for hkey in hour_keys:
+                    hour_segment = self._segment(hkey)
+                    if not hour_segment.log_path.exists():  # Already folded by another worker
+                        continue
+                    day_segment.append(list(hour_segment.read()))
+                    hour_segment.remove()
+                    self._forget(hkey)
+            compacted += 1
+        return compacted
+
+    def apply_retention(self, now: Optional[float] = None) -> int:
+        """Drop buckets that ended before the retention horizon"""
+        now = time.time() if now is None else now
+        horizon = now - self.retention_hours * HOUR
+        removed = 0
+        with self._write_lock():
+            for key in self._existing_keys():
+                if key_end(key) <= horizon:
+                    self._segment(key).remove()
+                    self._forget(key)
+                    removed += 1
+        return removed
+
+    def maintain(self, now: Optional[float] = None) -> None:
+        self.apply_retention(now)
+        self.compact(now)
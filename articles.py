@@ -0,0 +1,151 @@
+import calendar
+import struct
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+# --- Article Record ---
+@dataclass
+class Article:
+    """Feed entry detached from feedparser, optionally annotated with extracted entities"""
+    title: str
+    link: str
+    description: str
+    published: float  # UTC epoch seconds
+    players: Optional[List[str]] = None  # None until entities have been extracted
+    teams: Optional[List[str]] = None
+
+    @property
+    def published_parsed(self) -> time.struct_time:
+        return time.gmtime(self.published)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Mirror FeedParserDict.get so helpers written for feed entries keep working"""
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "title": self.title,
+            "link": self.link,
+            "description": self.description,
+            "published": self.published,
+            "players": self.players or [],
+            "teams": self.teams or [],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Article":
+        return cls(
+            title=data.get("title") or "",
+            link=data.get("link") or "",
+            description=data.get("description") or "",
+            published=float(data.get("published") or 0.0),
+            players=list(data.get("players") or []),
+            teams=list(data.get("teams") or []),
+        )
+
+def article_from_entry(entry: Any) -> Optional[Article]:
+    """Convert a feedparser entry (or an Article) into an Article, skipping undated entries"""
+    if isinstance(entry, Article):
+        return entry
+    published_parsed = getattr(entry, "published_parsed", None)
+    if not published_parsed:
+        return None
+    return Article(
+        title=entry.get("title") or "",
+        link=entry.get("link") or "",
+        description=entry.get("description") or "",
+        published=float(calendar.timegm(published_parsed)),
+    )
+
+# --- Binary Serialization ---
+# Compact record format for cache backends: varint-prefixed UTF-8 strings, a little-endian
+# double for the timestamp, and string lists prefixed with count + 1 (0 meaning None).
+ARTICLES_FORMAT = b"A1"
+ENTITIES_FORMAT = b"E1"
+_DOUBLE = struct.Struct("<d")
+
+def _write_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    n = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+def _write_str(out: bytearray, s: str) -> None:
+    raw = s.encode("utf-8")
+    _write_varint(out, len(raw))
+    out += raw
+
+def _read_str(data: bytes, pos: int) -> Tuple[str, int]:
+    length, pos = _read_varint(data, pos)
+    return data[pos:pos + length].decode("utf-8"), pos + length
+
+def _write_str_list(out: bytearray, values: Optional[Sequence[str]]) -> None:
+    if values is None:
+        _write_varint(out, 0)
+        return
+    _write_varint(out, len(values) + 1)
+    for value in values:
+        _write_str(out, value)
+
+def _read_str_list(data: bytes, pos: int) -> Tuple[Optional[List[str]], int]:
+    count, pos = _read_varint(data, pos)
+    if count == 0:
+        return None, pos
+    values = []
+    for _ in range(count - 1):
+        value, pos = _read_str(data, pos)
+        values.append(value)
+    return values, pos
+
+def encode_articles(articles: Sequence[Article]) -> bytes:
+    out = bytearray(ARTICLES_FORMAT)
+    _write_varint(out, len(articles))
+    for a in articles:
+        _write_str(out, a.title)
+        _write_str(out, a.link)
+        _write_str(out, a.description)
+        out += _DOUBLE.pack(a.published)
+        _write_str_list(out, a.players)
+        _write_str_list(out, a.teams)
+    return bytes(out)
+
+def decode_articles(data: bytes) -> Optional[List[Article]]:
+    """Inverse of encode_articles; None for data in an unknown format"""
+    if data[:2] != ARTICLES_FORMAT:
+        return None
+    count, pos = _read_varint(data, 2)
+    articles = []
+    for _ in range(count):
+        title, pos = _read_str(data, pos)
+        link, pos = _read_str(data, pos)
+        description, pos = _read_str(data, pos)
+        (published,) = _DOUBLE.unpack_from(data, pos)
+        pos += _DOUBLE.size
+        players, pos = _read_str_list(data, pos)
+        teams, pos = _read_str_list(data, pos)
+        articles.append(Article(title, link, description, published, players, teams))
+    return articles
+
+def encode_entities(players: Set[str], teams: Set[str]) -> bytes:
+    out = bytearray(ENTITIES_FORMAT)
+    _write_str_list(out, sorted(players))
+    _write_str_list(out, sorted(teams))
+    return bytes(out)
+
+def decode_entities(data: bytes) -> Optional[Tuple[Set[str], Set[str]]]:
+    if data[:2] != ENTITIES_FORMAT:
+        return None
+    players, pos = _read_str_list(data, 2)
+    teams, _ = _read_str_list(data, pos)
+    return set(players or []), set(teams or [])
@@ -0,0 +1,309 @@
+"""ASGI entry point serving the same Flask routes without pinning a thread per upstream fetch.
+
+Run with any ASGI server, e.g. `uvicorn asgi:application --workers 4`.
+
+For /transfers and /transfers/link the news feed is downloaded on the event loop
+(httpx) before the request reaches Flask, with identical in-flight downloads shared.
+The Flask view then runs on a bounded thread pool and finds the feed already fetched,
+so pool threads only do CPU work (parsing, entity extraction, rendering). Every other
+route goes straight to the pool. Without httpx installed, feeds are fetched inside
+the pool like under WSGI.
+
+Admission control (scheduler.py) happens here, but a slot only covers the CPU phase: a
+feed download holds no slot, since it costs the server nothing but a socket and is bounded
+by ASGI_MAX_UPSTREAM_CONNECTIONS distinct downloads instead (new ones beyond that are shed).
+Requests queued for a slot wait on the event loop, not on a thread. Under ASGI every news
+search takes a "news" slot, deep-queued (ASGI_NEWS_QUEUE) and sized to the CPU pool
+(ASGI_NEWS_CONCURRENCY); the "news_followers" pool is not used.
+"""
+import asyncio
+import contextvars
+import io
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Mapping, Optional, Tuple, Union
+
+import app as webapp
+from articles import Article
+from scheduler import ADMITTED_ENVIRON_KEY, ARRIVAL_ENVIRON_KEY, Overloaded, RoutePool
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+CPU_WORKERS = int(os.environ.get("ASGI_CPU_WORKERS", (os.cpu_count() or 1) * 4))
+UPSTREAM_TIMEOUT = float(os.environ.get("ASGI_UPSTREAM_TIMEOUT", 15))
+MAX_UPSTREAM_CONNECTIONS = int(os.environ.get("ASGI_MAX_UPSTREAM_CONNECTIONS", 256))
+NEWS_CONCURRENCY = int(os.environ.get("ASGI_NEWS_CONCURRENCY", max(1, CPU_WORKERS // 2)))
+NEWS_QUEUE = int(os.environ.get("ASGI_NEWS_QUEUE", 256))
+PREFETCH_PATHS = {"/transfers", "/transfers/link"}
+
+EXECUTOR = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="asgi-cpu")
+
+# The "news" pool's WSGI sizing assumes a slot spans the upstream download and a queued request
+# holds a thread; here it spans only the CPU phase and queued requests are futures
+_news_pool = webapp.SCHEDULER.pools.get("news")
+if _news_pool is not None:
+    _news_pool.concurrency = max(1, NEWS_CONCURRENCY)
+    _news_pool.queue_size = max(0, NEWS_QUEUE)
+
+class UpstreamSaturated(Exception):
+    """MAX_UPSTREAM_CONNECTIONS distinct feed downloads are already in flight"""
+
+# --- Async Feed Fetching ---
+class AsyncFeedFetcher:
+    """Downloads feeds on the event loop; concurrent requests for one URL share a download"""
+
+    def __init__(self):
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=UPSTREAM_TIMEOUT,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=MAX_UPSTREAM_CONNECTIONS),
+            )
+        return self._client
+
+    async def fetch(self, rss_url: str, timeout: Optional[float] = None, bounded: bool = True) -> List[Article]:
+        """Articles of rss_url; raises UpstreamSaturated (when bounded) rather than queue a new download"""
+        loop = asyncio.get_running_loop()
+        # The cache may be SQLite (blocking, with a busy timeout), so look it up off the loop
+        cached = await loop.run_in_executor(None, webapp.get_cached_feed, rss_url)
+        if cached is not None:
+            return cached
+        future = self._in_flight.get(rss_url)
+        if future is not None:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        if bounded and len(self._in_flight) >= MAX_UPSTREAM_CONNECTIONS:
+            raise UpstreamSaturated(f"{len(self._in_flight)} feed downloads in flight")
+        future = self._in_flight[rss_url] = loop.create_future()
+        try:
+            response = await asyncio.wait_for(self.client.get(rss_url), timeout)
+            response.raise_for_status()  # An error page is a failed fetch, as under WSGI, not an empty feed
+            articles = await loop.run_in_executor(
+                EXECUTOR, webapp.parse_feed, rss_url, response.content, dict(response.headers)
+            )
+            future.set_result(articles)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved so an unawaited failure is not logged
+        finally:
+            self._in_flight.pop(rss_url, None)
+        return await future
+
+    def in_flight(self, rss_url: str) -> bool:
+        return rss_url in self._in_flight
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+FETCHER = AsyncFeedFetcher() if httpx is not None else None
+
+# --- Admission ---
+class LoopAdmission:
+    """Admits requests into scheduler pools from the event loop; queued requests wait on futures.
+
+    Slots are handed to waiters in arrival order by a release listener on each pool, which also
+    fires for the "news" slots that claim_leader_slot() takes and releases on a CPU worker thread.
+    """
+
+    def __init__(self, pools: Mapping[str, RoutePool]):
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {name: deque() for name in pools}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        for pool in pools.values():
+            pool.add_release_listener(self._on_release)
+
+    async def acquire(self, pool: RoutePool) -> None:
+        """Take a slot in pool, waiting up to pool.max_wait; raises Overloaded when shed"""
+        self._loop = asyncio.get_running_loop()
+        if pool.try_acquire():
+            return
+        pool.enqueue()
+        waiter = self._loop.create_future()
+        self._waiters[pool.name].append(waiter)
+        try:
+            await asyncio.wait_for(waiter, pool.max_wait)
+        except asyncio.TimeoutError:
+            raise pool.leave_queue(timed_out=True) from None
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                pool.release(0.0)  # Client went away just as it was handed the slot
+            else:
+                pool.leave_queue(timed_out=False)
+            raise
+
+    def _on_release(self, pool: RoutePool) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._wake, pool)
+        except RuntimeError:  # Loop closed since the check
+            pass
+
+    def _wake(self, pool: RoutePool) -> None:
+        waiters = self._waiters[pool.name]
+        while waiters:
+            if waiters[0].done():  # Timed out or cancelled; it already left the pool's queue
+                waiters.popleft()
+            elif pool.try_promote():
+                waiters.popleft().set_result(None)
+            else:
+                return
+
+ADMISSION = LoopAdmission(webapp.SCHEDULER.pools)
+
+# --- WSGI Bridge ---
+def build_environ(scope: dict, body: bytes) -> dict:
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+        elif name == "CONTENT_LENGTH":
+            environ["CONTENT_LENGTH"] = value
+        else:
+            key = f"HTTP_{name}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+def call_wsgi(environ: dict) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started["status"] = int(status.split(" ", 1)[0])
+        started["headers"] = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+
+    result = webapp.application(environ, start_response)
+    try:
+        body = b"".join(result)
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return started["status"], started["headers"], body
+
+# --- ASGI Application ---
+async def read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+async def prefetch_feeds(scope: dict, args: Mapping[str, str],
+                         deadline: Optional[float]) -> Dict[str, Union[List[Article], Exception]]:
+    if FETCHER is None or scope["path"] not in PREFETCH_PATHS:
+        return {}
+    query = webapp.feed_query_for_request(scope["path"], args)
+    if query is None:
+        return {}
+    rss_url = webapp.build_feed_url(query)
+    timeout = None if deadline is None else deadline - time.monotonic()
+    if timeout is not None and timeout < webapp.MIN_FETCH_BUDGET:
+        return {}
+    try:
+        return {rss_url: await FETCHER.fetch(rss_url, timeout, bounded=deadline is not None)}
+    except UpstreamSaturated:
+        raise
+    except Exception as e:
+        # Hand the failure to the view, which reports it like a failed WSGI fetch instead of
+        # retrying the download synchronously on the CPU pool
+        return {rss_url: webapp.NewsFetchError(str(e) or type(e).__name__)}
+
+def select_pool(path: str, args: Mapping[str, str]) -> Optional[RoutePool]:
+    """The scheduler's pool for the CPU phase. Shared downloads already happened on the loop, and a
+    search that would follow an in-flight computation may find it finished by the time it runs, so
+    every news search takes a "news" slot rather than a "news_followers" one"""
+    pool = webapp.SCHEDULER.pool_for(path, args)
+    if pool is not None and pool.name == "news_followers":
+        return webapp.SCHEDULER.pools.get("news", pool)
+    return pool
+
+async def send_shed(send, retry_after: int) -> None:
+    await send({"type": "http.response.start", "status": 503, "headers": [
+        (b"content-type", b"text/plain; charset=utf-8"), (b"retry-after", str(retry_after).encode("latin-1")),
+    ]})
+    await send({"type": "http.response.body", "body": b"Server busy, please retry shortly\n"})
+
+async def lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            # Build lookup tables off the loop so the first requests don't stall it
+            await asyncio.get_running_loop().run_in_executor(EXECUTOR, webapp.warm_up)
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if FETCHER is not None:
+                await FETCHER.close()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+    arrived = time.monotonic()
+    body = await read_body(receive)
+    environ = build_environ(scope, body)
+    environ[ARRIVAL_ENVIRON_KEY] = arrived
+    # Parse the query string exactly as the view will (first value wins, UTF-8), so the prefetched
+    # feed URL matches the one the view looks up
+    args = webapp.app.request_class(environ, populate_request=False, shallow=True).args
+    pool = select_pool(scope["path"], args)
+    try:
+        prefetched = await prefetch_feeds(scope, args, arrived + pool.deadline if pool is not None else None)
+        if pool is not None:
+            await ADMISSION.acquire(pool)
+    except UpstreamSaturated:
+        await send_shed(send, pool.reject().retry_after)
+        return
+    except Overloaded as e:
+        await send_shed(send, e.retry_after)
+        return
+    admitted_at = time.monotonic()
+    try:
+        if pool is not None:
+            environ[ADMITTED_ENVIRON_KEY] = pool.name
+        context = contextvars.copy_context()
+        context.run(webapp._prefetched_feeds.set, prefetched)
+        status, headers, response_body = await asyncio.get_running_loop().run_in_executor(
+            EXECUTOR, context.run, call_wsgi, environ
+        )
+    finally:
+        if pool is not None:
+            pool.release(time.monotonic() - admitted_at)
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": response_body})
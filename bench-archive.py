@@ -0,0 +1,92 @@
+"""Benchmark range-query latency of the article archive as it grows.
+
+Usage: python bench-archive.py [--articles 1000000] [--entities 5000] [--dir /tmp/archive-bench]
+"""
+import argparse
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from archive import ArticleArchive, HOUR
+from articles import Article
+
+WINDOWS = {"24h": 24, "7d": 7 * 24, "30d": 30 * 24}
+
+def synthetic_articles(count, entities, span_hours, now):
+    """Yield articles in publication order, each mentioning 1-3 random entities"""
+    start = now - span_hours * HOUR
+    step = span_hours * HOUR / count
+    for i in range(count):
+        mentioned = random.sample(entities, random.randint(1, 3))
+        yield Article(
+            title=f"Transfer rumour {i}: {' and '.join(mentioned)}",
+            link=f"https://example.com/article/{i}",
+            description="Synthetic benchmark article",
+            published=start + i * step,
+            players=mentioned[:1],
+            teams=mentioned[1:],
+        )
+
+def time_queries(archive, entities, now, repeats):
+    rows = []
+    for label, hours in WINDOWS.items():
+        for entity_filter in (False, True):
+            samples = []
+            found = 0
+            for _ in range(repeats):
+                entity = random.choice(entities) if entity_filter else None
+                t0 = time.perf_counter()
+                found = len(archive.query(hours, entity=entity, now=now))
+                samples.append(time.perf_counter() - t0)
+            rows.append((label, "entity" if entity_filter else "all", statistics.median(samples) * 1000, found))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=1_000_000)
+    parser.add_argument("--entities", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--dir", default=None, help="archive directory (default: fresh temp dir)")
+    args = parser.parse_args()
+
+    root = args.dir or tempfile.mkdtemp(prefix="archive-bench-")
+    entities = [f"entity {i}" for i in range(args.entities)]
+    now = time.time()
+    archive = ArticleArchive(root, retention_hours=31 * 24, compact_after_hours=10_000)
+    checkpoints = sorted({c for c in (10_000, 100_000, 1_000_000, args.articles) if c <= args.articles})
+
+    print(f"Archive at {root}")
+    print(f"{'articles':>10} {'window':>6} {'filter':>7} {'median ms':>10} {'results':>8}")
+    batch, appended, append_time = [], 0, 0.0
+    for article in synthetic_articles(args.articles, entities, 30 * 24, now):
+        batch.append(article)
+        if len(batch) < args.batch:
+            continue
+        t0 = time.perf_counter()
+        archive.append(batch)
+        append_time += time.perf_counter() - t0
+        appended += len(batch)
+        batch = []
+        if appended in checkpoints:
+            for label, kind, ms, found in time_queries(archive, entities, now, args.repeats):
+                print(f"{appended:>10} {label:>6} {kind:>7} {ms:>10.2f} {found:>8}")
+    if batch:
+        archive.append(batch)
+        appended += len(batch)
+    print(f"Append throughput: {appended / max(append_time, 1e-9):,.0f} articles/s")
+
+    t0 = time.perf_counter()
+    archive.compact_after_hours = 48
+    days = archive.compact(now)
+    print(f"Compacted {days} days in {time.perf_counter() - t0:.2f}s")
+    for label, kind, ms, found in time_queries(archive, entities, now, args.repeats):
+        print(f"{'compacted':>10} {label:>6} {kind:>7} {ms:>10.2f} {found:>8}")
+
+    if args.dir is None:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
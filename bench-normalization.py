@@ -0,0 +1,88 @@
+"""Check normalization.py against the original unicodedata implementation and benchmark it.
+
+Every value in player-stats.sql and team-stats.sql (plus randomized accented strings)
+must normalize byte-identically; the script exits non-zero on any mismatch.
+
+Usage: python bench-normalization.py [--fuzz 200000] [--repeats 5]
+"""
+import argparse
+import random
+import sys
+import time
+import unicodedata
+
+import app
+import normalization
+from normalization import normalize_name, normalize_team_name
+
+# Reference implementations, as they were in app.py
+def reference_normalize_name(s: str) -> str:
+    return ''.join(
+        c for c in unicodedata.normalize('NFD', s.lower())
+        if unicodedata.category(c) != 'Mn'
+    )
+
+def reference_normalize_team_name(s: str) -> str:
+    return ''.join(
+        c for c in unicodedata.normalize('NFD', s.lower())
+        if unicodedata.category(c) != 'Mn'
+    ).replace(' fc','').replace(' afc','').replace('.','').replace(',','').replace('-',' ').strip()
+
+def sql_values():
+    values = []
+    for path, table in ((app.PLAYER_FILE, "player_stats"), (app.TEAM_FILE, "team_stats")):
+        for row in app.load_sql_table(str(path), table)[1]:
+            values.extend(row)
+    return values
+
+def fuzz_strings(count):
+    alphabet = [chr(c) for c in range(0x20, 0x250)] + [chr(c) for c in range(0x300, 0x370)]
+    alphabet += [chr(c) for c in range(0x1E00, 0x1F00)] + ["Ⱥ", "Ω", "ß", "ﬁ", "가", "ǅ", "-", ".", ",", " fc", " afc"]
+    return ["".join(random.choices(alphabet, k=random.randint(1, 80))) for _ in range(count)]
+
+def check(inputs):
+    mismatches = 0
+    for s in inputs:
+        for fast, ref in ((normalize_name, reference_normalize_name), (normalize_team_name, reference_normalize_team_name)):
+            if fast(s) != ref(s):
+                mismatches += 1
+                print(f"MISMATCH {fast.__name__}({s!r}): {fast(s)!r} != {ref(s)!r}")
+    return mismatches
+
+def throughput(func, inputs, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for s in inputs:
+            func(s)
+        best = min(best, time.perf_counter() - t0)
+    return len(inputs) / best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fuzz", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    values = sql_values()
+    fuzz = fuzz_strings(args.fuzz)
+    mismatches = check(values) + check(fuzz)
+    print(f"Equivalence: {len(values)} SQL values + {len(fuzz)} fuzz strings, {mismatches} mismatches")
+
+    long_texts = [" ".join(random.sample(values, 40)) for _ in range(2000)]
+    print(f"{'workload':<22} {'reference/s':>14} {'fast/s':>14} {'speedup':>8}")
+    for label, inputs, fast, ref in (
+        ("names (memo warm)", values, normalize_name, reference_normalize_name),
+        ("team names", values, normalize_team_name, reference_normalize_team_name),
+        ("article texts", long_texts, normalize_name, reference_normalize_name),
+    ):
+        ref_rate = throughput(ref, inputs, args.repeats)
+        fast_rate = throughput(fast, inputs, args.repeats)
+        print(f"{label:<22} {ref_rate:>14,.0f} {fast_rate:>14,.0f} {fast_rate / ref_rate:>7.1f}x")
+    normalization._normalize_short.cache_clear()
+    cold_rate = throughput(normalization._normalize_text, values, args.repeats)
+    print(f"{'names (no memo)':<22} {'':>14} {cold_rate:>14,.0f}")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Measure startup time and memory of the entity data per LEAGUE_SHARDS configuration.
+
+Each configuration is loaded in a fresh subprocess (app.warm_up()) so peak RSS is not
+shared between runs. The first row loads every shard; then each league alone.
+
+Usage: python bench-shards.py [--leagues "Premier League,La Liga"]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent
+
+PROBE = """
+import json, resource, time
+import app
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+app.warm_up()
+elapsed = time.perf_counter() - t0
+shards = [s.stats() for s in app.get_shards().values()]
+print(json.dumps({
+    "startup_s": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "data_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) / 1024,
+    "players": sum(s["player_aliases"] for s in shards),
+    "clubs": sum(s["club_aliases"] for s in shards),
+    "automaton_mb": sum(s["automaton_bytes"] for s in shards) / 1024 / 1024,
+    "leagues": sorted(s["league"] for s in shards),
+}))
+"""
+
+def measure(leagues):
+    env = dict(os.environ, LEAGUE_SHARDS=leagues, CACHE_BACKEND="none")
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=DATA_DIR, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leagues", help="only measure this comma-separated selection (plus the full load)")
+    args = parser.parse_args()
+
+    full = measure("")
+    selections = [args.leagues] if args.leagues else full["leagues"]
+    print(f"{'LEAGUE_SHARDS':<34} {'startup':>8} {'rss':>8} {'data':>8} {'automata':>9} {'aliases':>8}")
+    for label, result in [("(all)", full)] + [(s, measure(s)) for s in selections]:
+        print(f"{label[:34]:<34} {result['startup_s']:>7.2f}s {result['rss_mb']:>6.1f}MB "
+              f"{result['data_mb']:>6.1f}MB {result['automaton_mb']:>7.2f}MB {result['players'] + result['clubs']:>8}")
+
+if __name__ == "__main__":
+    main()
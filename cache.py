@@ -0,0 +1,241 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# --- Cache Backends ---
+# Values are opaque bytes (see articles.encode_articles / encode_entities); every entry
+# carries a TTL and each backend is bounded by the total size of the values it holds.
+# A cache is an optimization: backend failures are logged and behave as misses / no-ops.
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 300.0
+
+logger = logging.getLogger(__name__)
+
+class CacheBackend(ABC):
+    """Interface shared by all cache backends"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float = DEFAULT_TTL) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+class NullCache(CacheBackend):
+    """Backend that stores nothing, for disabling caching"""
+
+    def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, value: bytes, ttl: float = DEFAULT_TTL) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+class MemoryCache(CacheBackend):
+    """Per-process LRU cache"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float = DEFAULT_TTL) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time() + ttl, value)
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": "memory", "entries": len(self._entries), "bytes": self._bytes,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+class SQLiteCache(CacheBackend):
+    """Host-wide cache in a SQLite file in WAL mode, shared by every worker process that opens it"""
+
+    # Size checks run a SUM over the table, so only do them every few writes
+    EVICTION_CHECK_INTERVAL = 64
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+        self._schema_ready = False
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> bool:
+        if not self._schema_ready:
+            try:
+                conn = self._conn()
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache ("
+                    "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL, size INTEGER NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)")
+                self._schema_ready = True
+            except (sqlite3.Error, OSError) as e:
+                self._failed("create schema", e)
+        return self._schema_ready
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+        logger.warning("SQLite cache %s failed (%s): %s", operation, self.path, error)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self._ensure_schema():
+            self.misses += 1
+            return None
+        try:
+            row = self._conn().execute(
+                "SELECT value FROM cache WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            self._failed("get", e)
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def set(self, key: str, value: bytes, ttl: float = DEFAULT_TTL) -> None:
+        if len(value) > self.max_bytes or not self._ensure_schema():
+            return
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires, size) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), time.time() + ttl, len(value)),
+            )
+            self._writes += 1
+            if self._writes % self.EVICTION_CHECK_INTERVAL == 0:
+                self.evict()
+        except (sqlite3.Error, OSError) as e:
+            self._failed("set", e)
+
+    def evict(self) -> None:
+        """Drop expired entries, then the soonest-to-expire ones until under max_bytes"""
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        while total > self.max_bytes:
+            rows = conn.execute("SELECT key, size FROM cache ORDER BY expires LIMIT 256").fetchall()
+            if not rows:
+                break
+            freed = 0
+            keys = []
+            for key, size in rows:
+                keys.append(key)
+                freed += size
+                if total - freed <= self.max_bytes:
+                    break
+            conn.executemany("DELETE FROM cache WHERE key = ?", [(k,) for k in keys])
+            self.evictions += len(keys)
+            total -= freed
+
+    def delete(self, key: str) -> None:
+        try:
+            self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+        except (sqlite3.Error, OSError) as e:
+            self._failed("delete", e)
+
+    def clear(self) -> None:
+        try:
+            self._conn().execute("DELETE FROM cache")
+        except (sqlite3.Error, OSError) as e:
+            self._failed("clear", e)
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            entries, size = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        except (sqlite3.Error, OSError) as e:
+            self._failed("stats", e)
+            entries, size = None, None
+        return {"backend": "sqlite", "path": self.path, "entries": entries, "bytes": size,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions, "errors": self.errors}
+
+def create_cache(kind: str, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> CacheBackend:
+    """Build a backend by name: 'memory', 'sqlite' or 'none'"""
+    if kind == "sqlite":
+        return SQLiteCache(path or "/tmp/scotbot-cache.sqlite3", max_bytes=max_bytes)
+    if kind == "none":
+        return NullCache()
+    if kind == "memory":
+        return MemoryCache(max_bytes=max_bytes)
+    raise ValueError(f"Unknown cache backend: {kind}")
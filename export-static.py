@@ -0,0 +1,157 @@
+"""Pre-render every /team-stats and /player-stats page (HTML + JSON) into a static tree.
+
+Files are named by content hash (e.g. team-stats/arsenal.3f9c2a1b7d4e.html) so they can be
+cached forever at the edge; manifest.json maps each route ("/team-stats?name=Arsenal") to
+its current files. With --incremental (the default when a manifest exists), pages whose
+underlying rows are unchanged since the last export are not re-rendered or rewritten.
+
+Usage: python export-static.py [--out static-export] [--workers 4] [--full]
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import time
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+
+from flask import render_template
+
+import app
+from normalization import normalize_name
+
+DATA_DIR = Path(__file__).parent
+MANIFEST_VERSION = 1
+_player_stats = None
+
+def slugify(name):
+    return re.sub(r"[^a-z0-9]+", "-", normalize_name(name)).strip("-") or "page"
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+def code_hash():
+    """Changes to templates or app.py invalidate every page"""
+    digest = hashlib.sha256()
+    for path in sorted((DATA_DIR / "templates").glob("*.html")) + [DATA_DIR / "app.py"]:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+def init_worker():
+    global _player_stats
+    stat_keys, rows = app.load_sql_table(str(app.PLAYER_FILE), "player_stats")
+    _player_stats = (stat_keys, app.SqlRowIndex(rows, 1))
+
+def page_data(kind, name):
+    """Template context plus the JSON payload that fully determines the page"""
+    if kind == "team":
+        context = app.build_team_stats_context(name)
+        payload = {
+            "name": name,
+            "team_info": asdict(context["team_info"]) if context["team_info"] else None,
+            "team_stats": context["team_stats"],
+            "players": context["players"],
+        }
+    else:
+        stat_keys, index = _player_stats
+        context = app.build_player_stats_context(name, stat_keys, index.match(name))
+        player_info = app.get_player_info(name)
+        payload = {
+            "name": name,
+            "player_info": asdict(player_info) if player_info else None,
+            "player_stats": context["player_stats"],
+        }
+    return context, payload
+
+def render_job(job):
+    kind, name, previous_source = job
+    context, payload = page_data(kind, name)
+    json_bytes = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    source = content_hash(json_bytes)
+    if source == previous_source:
+        return kind, name, source, None, None
+    template = "team-stats.html" if kind == "team" else "player-stats.html"
+    with app.app.test_request_context(route_for(kind, name)):
+        html = render_template(template, **context).encode("utf-8")
+    return kind, name, source, html, json_bytes
+
+def route_for(kind, name):
+    if kind == "team":
+        return f"/team-stats?name={urllib.parse.quote(name)}"
+    return f"/player-stats?player={urllib.parse.quote(name)}"
+
+def list_jobs():
+    _, team_rows = app.get_team_stats_table()
+    teams = {row[2] for row in team_rows if len(row) > 2}
+    teams |= {info.club for info in app.get_player_lookup().values() if info.club != "Unknown"}
+    players = {names[0] for names in app.get_player_aliases().values()}
+    return [("team", t) for t in sorted(teams)] + [("player", p) for p in sorted(players)]
+
+def write_file(out_dir, relative, data):
+    path = out_dir / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default="static-export")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--full", action="store_true", help="ignore the previous manifest and re-render everything")
+    args = parser.parse_args()
+
+    out_dir = Path(args.out)
+    manifest_path = out_dir / "manifest.json"
+    previous = {}
+    code = code_hash()
+    if manifest_path.exists() and not args.full:
+        old = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if old.get("version") == MANIFEST_VERSION and old.get("code") == code:
+            previous = old.get("pages", {})
+
+    t0 = time.perf_counter()
+    app.warm_up()
+    jobs = [(kind, name, previous.get(route_for(kind, name), {}).get("source")) for kind, name in list_jobs()]
+    pages, rendered, unchanged = {}, 0, 0
+    ctx = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=ctx, initializer=init_worker) as pool:
+        for kind, name, source, html, json_bytes in pool.map(render_job, jobs, chunksize=64):
+            route = route_for(kind, name)
+            if html is None:
+                pages[route] = previous[route]
+                unchanged += 1
+                continue
+            folder = "team-stats" if kind == "team" else "player-stats"
+            stem = f"{folder}/{slugify(name)}"
+            entry = {
+                "html": f"{stem}.{content_hash(html)}.html",
+                "json": f"{stem}.{content_hash(json_bytes)}.json",
+                "source": source,
+            }
+            write_file(out_dir, entry["html"], html)
+            write_file(out_dir, entry["json"], json_bytes)
+            pages[route] = entry
+            rendered += 1
+
+    # Remove files no longer referenced by any page
+    live = {path for entry in pages.values() for path in (entry["html"], entry["json"])}
+    removed = 0
+    for folder in ("team-stats", "player-stats"):
+        for path in (out_dir / folder).glob("*"):
+            if path.relative_to(out_dir).as_posix() not in live:
+                path.unlink()
+                removed += 1
+
+    write_file(out_dir, "manifest.json", json.dumps(
+        {"version": MANIFEST_VERSION, "code": code, "pages": pages}, ensure_ascii=False, indent=1, sort_keys=True
+    ).encode("utf-8"))
+    print(f"Exported {len(pages)} pages to {out_dir}: {rendered} rendered, {unchanged} unchanged, "
+          f"{removed} stale files removed in {time.perf_counter() - t0:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import threading
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+# --- Lazy Initialization ---
+class Lazy(Generic[T]):
+    """Value built on first use, exactly once, even when first requested from several threads"""
+
+    def __init__(self, builder: Callable[[], T]):
+        self._builder = builder
+        self._lock = threading.Lock()
+        self._built = False
+        self._value: T
+
+    @property
+    def ready(self) -> bool:
+        return self._built
+
+    def get(self) -> T:
+        if self._built:
+            return self._value
+        with self._lock:
+            if not self._built:
+                self._value = self._builder()
+                self._built = True
+        return self._value
@@ -0,0 +1,139 @@
+"""Replay a query log against a running instance at a target request rate.
+
+Each JSONL record is one request: {"path": "/transfers?query=Arsenal"},
+{"endpoint": "/transfers/link", "params": {"player": "...", "team": "..."}} or
+just {"query": "Arsenal"} (treated as /transfers). Without --log a mixed workload
+is generated from player-stats.sql. Requests are issued open-loop, so a slow server
+shows up as latency and errors rather than a lower offered rate.
+
+Usage: python load-test.py --base-url http://127.0.0.1:8000 [--log queries.jsonl] [--rps 50] [--duration 30]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import app
+
+def load_names():
+    _, rows = app.load_sql_table(str(app.PLAYER_FILE), "player_stats")
+    rows = [row for row in rows if len(row) > 4]
+    return sorted({row[1] for row in rows}), sorted({row[4] for row in rows})
+
+def record_to_path(record):
+    if "path" in record:
+        return record["path"]
+    if "endpoint" in record:
+        return record["endpoint"] + "?" + urllib.parse.urlencode(record.get("params", {}))
+    return "/transfers?" + urllib.parse.urlencode({"query": record["query"]})
+
+def load_log(path):
+    with open(path, encoding="utf-8") as f:
+        return [record_to_path(json.loads(line)) for line in f if line.strip()]
+
+def synthetic_log(count):
+    players, clubs = load_names()
+    paths = []
+    for _ in range(count):
+        player, club = random.choice(players), random.choice(clubs)
+        kind = random.random()
+        if kind < 0.4:
+            prefix = player[:random.randint(2, 6)]
+            paths.append("/autocomplete?" + urllib.parse.urlencode({"query": prefix}))
+        elif kind < 0.7:
+            paths.append("/transfers?" + urllib.parse.urlencode({"query": random.choice([player, club])}))
+        elif kind < 0.8:
+            paths.append("/transfers/link?" + urllib.parse.urlencode({"player": player, "team": club}))
+        elif kind < 0.9:
+            paths.append("/team-stats?" + urllib.parse.urlencode({"name": club}))
+        else:
+            paths.append("/player-stats?" + urllib.parse.urlencode({"player": player}))
+    return paths
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class Results:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, status, latency, error):
+        with self._lock:
+            self.latencies[endpoint].append(latency)
+            self.statuses[endpoint][status] += 1
+            if error:
+                self.errors[endpoint] += 1
+
+def issue(base_url, path, timeout, results, scheduled):
+    """Latency is measured from the scheduled send time, so client-side queueing still counts"""
+    endpoint = urllib.parse.urlparse(path).path
+    status, error = 0, True
+    try:
+        with urllib.request.urlopen(base_url + path, timeout=timeout) as response:
+            response.read()
+            status = response.status
+            error = status >= 400
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = 0
+    results.add(endpoint, status, time.perf_counter() - scheduled, error)
+
+def report(results, elapsed):
+    print(f"{'endpoint':<18} {'count':>7} {'rps':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}  statuses")
+    all_latencies, total_errors = [], 0
+    for endpoint in sorted(results.latencies):
+        values = sorted(results.latencies[endpoint])
+        all_latencies.extend(values)
+        total_errors += results.errors[endpoint]
+        statuses = " ".join(f"{s}:{n}" for s, n in sorted(results.statuses[endpoint].items()))
+        print(f"{endpoint:<18} {len(values):>7} {len(values) / elapsed:>8.1f} {percentile(values, 50) * 1000:>8.1f} "
+              f"{percentile(values, 90) * 1000:>8.1f} {percentile(values, 99) * 1000:>8.1f} {values[-1] * 1000:>8.1f} "
+              f"{results.errors[endpoint] / len(values):>7.1%}  {statuses}")
+    all_latencies.sort()
+    if all_latencies:
+        print(f"{'TOTAL':<18} {len(all_latencies):>7} {len(all_latencies) / elapsed:>8.1f} {percentile(all_latencies, 50) * 1000:>8.1f} "
+              f"{percentile(all_latencies, 90) * 1000:>8.1f} {percentile(all_latencies, 99) * 1000:>8.1f} "
+              f"{all_latencies[-1] * 1000:>8.1f} {total_errors / len(all_latencies):>7.1%}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--log", help="JSONL query log to replay (cycled if shorter than the run)")
+    parser.add_argument("--rps", type=float, default=50.0, help="target request rate")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout")
+    parser.add_argument("--max-in-flight", type=int, default=512)
+    args = parser.parse_args()
+
+    total = max(1, int(args.rps * args.duration))
+    paths = load_log(args.log) if args.log else synthetic_log(total)
+    if not paths:
+        parser.error(f"no requests in {args.log}")
+    results = Results()
+    base_url = args.base_url.rstrip("/")
+    print(f"Replaying {total} requests at {args.rps} rps against {base_url}")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.max_in_flight) as pool:
+        for i in range(total):
+            scheduled = start + i / args.rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(issue, base_url, paths[i % len(paths)], args.timeout, results, scheduled)
+    report(results, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main()
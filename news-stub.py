@@ -0,0 +1,92 @@
+"""Local stand-in for the Google News RSS search endpoint, for offline load testing.
+
+Serves /rss/search?q=... with generated articles that mention the query alongside
+random players and clubs from player-stats.sql. Run the app against it with
+NEWS_BASE_URL=http://127.0.0.1:8081.
+
+Usage: python news-stub.py [--port 8081] [--latency-ms 150] [--jitter-ms 50] [--items 60] [--entity-density 2.0]
+"""
+import argparse
+import random
+import time
+import urllib.parse
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+import app
+
+VERBS = ["linked with", "in talks with", "set to join", "agrees terms with", "rejects", "scouted by", "eyed by"]
+
+def load_names():
+    _, rows = app.load_sql_table(str(app.PLAYER_FILE), "player_stats")
+    rows = [row for row in rows if len(row) > 4]
+    return sorted({row[1] for row in rows}), sorted({row[4] for row in rows})
+
+def build_feed(query, players, clubs, items, density, max_age_hours):
+    now = time.time()
+    entries = []
+    for i in range(items):
+        mentioned = [query]
+        for _ in range(max(0, int(random.expovariate(1 / density)) if density > 0 else 0)):
+            mentioned.append(random.choice(players if random.random() < 0.5 else clubs))
+        if len(mentioned) == 1:
+            mentioned.append(random.choice(clubs))
+        title = f"{mentioned[0]} {random.choice(VERBS)} {', '.join(mentioned[1:])}"
+        published = formatdate(now - random.uniform(0, max_age_hours * 3600), usegmt=True)
+        link = f"https://stub.news/{urllib.parse.quote(query)}/{i}-{random.getrandbits(32):08x}"
+        entries.append(
+            f"<item><title>{escape(title)}</title><link>{escape(link)}</link>"
+            f"<description>{escape(title)} - stub coverage</description><pubDate>{published}</pubDate></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>{escape(query)} - Stub News</title>{''.join(entries)}</channel></rss>"
+    )
+
+def make_handler(args, players, clubs):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urllib.parse.urlparse(self.path)
+            if parsed.path != "/rss/search":
+                self.send_error(404)
+                return
+            query = urllib.parse.parse_qs(parsed.query).get("q", [""])[0]
+            delay = max(0.0, random.gauss(args.latency_ms, args.jitter_ms)) / 1000
+            time.sleep(delay)
+            body = build_feed(query, players, clubs, args.items, args.entity_density, args.max_age_hours).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *log_args):
+            if args.verbose:
+                super().log_message(format, *log_args)
+
+    return StubHandler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="mean upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=50.0, help="latency standard deviation")
+    parser.add_argument("--items", type=int, default=60, help="articles per feed")
+    parser.add_argument("--entity-density", type=float, default=2.0, help="mean extra entities per article")
+    parser.add_argument("--max-age-hours", type=float, default=72.0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    players, clubs = load_names()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args, players, clubs))
+    server.daemon_threads = True
+    print(f"Stub news server on http://{args.host}:{args.port} ({len(players)} players, {len(clubs)} clubs)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
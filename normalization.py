@@ -0,0 +1,63 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+# --- Name Normalization ---
+# Lower-case, decompose (NFD) and drop nonspacing marks (category Mn). For text made
+# only of Latin characters that is equivalent to a per-character mapping, so it is
+# precomputed into a str.translate table; anything outside those blocks falls back
+# to the reference unicodedata path to stay byte-identical. Pure-ASCII input (most
+# names and article text) needs only lower(), so it skips both table and memo.
+
+# Basic Latin through Latin Extended-B, combining diacritics, Latin Extended Additional
+_TABLE_RANGES = ((0x0000, 0x024F), (0x0300, 0x036F), (0x1E00, 0x1EFF))
+_UNCOVERED_RE = re.compile("[^" + "".join(f"\\u{lo:04x}-\\u{hi:04x}" for lo, hi in _TABLE_RANGES) + "]")
+MEMO_MAX_LENGTH = 64
+MEMO_SIZE = 16384
+
+def _strip_marks_reference(s: str) -> str:
+    return ''.join(
+        c for c in unicodedata.normalize('NFD', s)
+        if unicodedata.category(c) != 'Mn'
+    )
+
+def _build_strip_table() -> dict:
+    table = {}
+    for lo, hi in _TABLE_RANGES:
+        for code in range(lo, hi + 1):
+            stripped = _strip_marks_reference(chr(code))
+            if stripped != chr(code):
+                table[code] = stripped
+    return table
+
+_STRIP_TABLE = _build_strip_table()
+# Applied after the ' fc'/' afc' suffix removal, matching the original replace chain
+_TEAM_PUNCT_TABLE = str.maketrans({'.': None, ',': None, '-': ' '})
+
+def _normalize_text(s: str) -> str:
+    lowered = s.lower()
+    if lowered.isascii():
+        return lowered
+    if _UNCOVERED_RE.search(lowered):
+        return _strip_marks_reference(lowered)
+    return lowered.translate(_STRIP_TABLE)
+
+_normalize_short = lru_cache(maxsize=MEMO_SIZE)(_normalize_text)
+
+def normalize_name(s: str) -> str:
+    """Lower-case and strip accents; short accented strings are memoized, long texts are not"""
+    if s.isascii():
+        return s.lower()
+    if len(s) <= MEMO_MAX_LENGTH:
+        return _normalize_short(s)
+    return _normalize_text(s)
+
+@lru_cache(maxsize=MEMO_SIZE)
+def _normalize_team_name(s: str) -> str:
+    return _normalize_text(s).replace(' fc', '').replace(' afc', '').translate(_TEAM_PUNCT_TABLE).strip()
+
+def normalize_team_name(s: str) -> str:
+    """Enhanced normalization for team names including common abbreviations"""
+    if len(s) <= MEMO_MAX_LENGTH:
+        return _normalize_team_name(s)
+    return _normalize_team_name.__wrapped__(s)
@@ -0,0 +1,228 @@
+import cProfile
+import hmac
+import io
+import itertools
+import math
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, Optional
+
+from flask import Blueprint, Flask, Response, abort, g, jsonify, request
+
+# --- Profiling ---
+# Two tools behind a shared token (PROFILING_TOKEN; everything is disabled when unset):
+#   * per-request cProfile, opted into with "X-Profile: 1" and sampled at PROFILE_SAMPLE_RATE
+#   * a process-wide statistical sampler producing flamegraph-compatible collapsed stacks
+# Both are bounded: a fixed number of stored profiles, capped sampler duration and stack count.
+
+TOKEN_HEADER = "X-Profile-Token"
+OPT_IN_HEADER = "X-Profile"
+MAX_STORED_PROFILES = 50
+PROFILE_TEXT_LINES = 60
+MAX_SAMPLER_SECONDS = 300.0
+MAX_SAMPLER_STACKS = 10_000
+MAX_STACK_DEPTH = 128
+
+# Python 3.12+ allows one active cProfile per process (and it sees every thread's calls),
+# so at most one request is profiled at a time; concurrent opt-ins are served unprofiled.
+_request_profile_lock = threading.Lock()
+
+class StackSampler:
+    """Samples every thread's stack at a fixed interval and aggregates collapsed stacks"""
+
+    def __init__(self, interval: float = 0.005, duration: float = 30.0, max_stacks: int = MAX_SAMPLER_STACKS):
+        self.interval = interval
+        self.duration = min(duration, MAX_SAMPLER_SECONDS)
+        self.max_stacks = max_stacks
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.dropped = 0
+        self.started_at = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + self.duration
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self._add(self._collapse(frame))
+            self._stop.wait(self.interval)
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        names = []
+        while frame is not None and len(names) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def _add(self, stack: str) -> None:
+        with self._lock:
+            self.samples += 1
+            if stack in self.stacks or len(self.stacks) < self.max_stacks:
+                self.stacks[stack] += 1
+            else:
+                self.dropped += 1
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed format: one 'frame;frame;frame count' line per stack"""
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+class Profiler:
+    """Holds profiling configuration, stored request profiles and the active sampler session"""
+
+    def __init__(self, token: Optional[str], sample_rate: float = 1.0):
+        self.token = token
+        self.sample_rate = sample_rate
+        self.profiles: Deque[Dict] = deque(maxlen=MAX_STORED_PROFILES)
+        self.sampler: Optional[StackSampler] = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def authorized(self) -> bool:
+        supplied = request.headers.get(TOKEN_HEADER)
+        return self.enabled and supplied is not None and hmac.compare_digest(supplied.encode(), self.token.encode())
+
+    def before_request(self) -> None:
+        if request.headers.get(OPT_IN_HEADER) != "1" or not self.authorized():
+            return
+        if random.random() >= self.sample_rate:
+            return
+        if not _request_profile_lock.acquire(blocking=False):
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # Another profiling tool (e.g. sys.monitoring user) is active
+            _request_profile_lock.release()
+            return
+        g.request_profiler = profiler
+        g.request_profile_start = time.perf_counter()
+
+    def _finish(self) -> Optional[cProfile.Profile]:
+        profiler = g.pop("request_profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            _request_profile_lock.release()
+        return profiler
+
+    def after_request(self, response: Response) -> Response:
+        profiler = self._finish()
+        if profiler is None:
+            return response
+        duration = time.perf_counter() - g.pop("request_profile_start")
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TEXT_LINES)
+        profile_id = next(self._ids)
+        self.profiles.append({
+            "id": profile_id,
+            "path": request.full_path,
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "timestamp": time.time(),
+            "stats": out.getvalue(),
+        })
+        response.headers["X-Profile-Id"] = str(profile_id)
+        return response
+
+    def teardown_request(self, exc: Optional[BaseException]) -> None:
+        # after_request is skipped when response handling itself fails; don't leak the profiler
+        self._finish()
+
+    def start_sampler(self, interval: float, duration: float) -> StackSampler:
+        with self._lock:
+            if self.sampler is not None and self.sampler.running:
+                self.sampler.stop()
+            self.sampler = StackSampler(interval=interval, duration=duration)
+            self.sampler.start()
+            return self.sampler
+
+def create_profiling_blueprint(profiler: Profiler) -> Blueprint:
+    bp = Blueprint("profiling", __name__, url_prefix="/_profile")
+
+    @bp.before_request
+    def require_token():
+        if not profiler.authorized():
+            abort(404)
+
+    @bp.route("/requests", methods=["GET"])
+    def list_profiles():
+        return jsonify([{k: v for k, v in p.items() if k != "stats"} for p in profiler.profiles])
+
+    @bp.route("/requests/<int:profile_id>", methods=["GET"])
+    def get_profile(profile_id):
+        for p in profiler.profiles:
+            if p["id"] == profile_id:
+                return Response(p["stats"], mimetype="text/plain")
+        abort(404)
+
+    @bp.route("/sampler/start", methods=["POST"])
+    def start_sampler():
+        try:
+            seconds = float(request.args.get("seconds", 30))
+            interval_ms = float(request.args.get("interval_ms", 5))
+        except ValueError:
+            return jsonify({"error": "seconds and interval_ms must be numbers"}), 400
+        if not (math.isfinite(seconds) and seconds > 0 and math.isfinite(interval_ms)):
+            return jsonify({"error": "seconds must be a positive number and interval_ms finite"}), 400
+        sampler = profiler.start_sampler(max(interval_ms, 1.0) / 1000, seconds)
+        return jsonify({"duration": sampler.duration, "interval_ms": sampler.interval * 1000})
+
+    @bp.route("/sampler/stop", methods=["POST"])
+    def stop_sampler():
+        if profiler.sampler is None:
+            abort(404)
+        profiler.sampler.stop()
+        return Response(profiler.sampler.collapsed(), mimetype="text/plain")
+
+    @bp.route("/sampler", methods=["GET"])
+    def sampler_output():
+        sampler = profiler.sampler
+        if sampler is None:
+            abort(404)
+        response = Response(sampler.collapsed(), mimetype="text/plain")
+        response.headers["X-Sampler-Running"] = "1" if sampler.running else "0"
+        response.headers["X-Sampler-Samples"] = str(sampler.samples)
+        response.headers["X-Sampler-Dropped"] = str(sampler.dropped)
+        return response
+
+    return bp
+
+def init_profiling(app: Flask, token: Optional[str], sample_rate: float = 1.0) -> Profiler:
+    """Attach request hooks and /_profile routes to app; a no-op surface unless token is set"""
+    profiler = Profiler(token, sample_rate)
+    if profiler.enabled:
+        app.before_request(profiler.before_request)
+        app.after_request(profiler.after_request)
+        app.teardown_request(profiler.teardown_request)
+    app.register_blueprint(create_profiling_blueprint(profiler))
+    return profiler
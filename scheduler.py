@@ -0,0 +1,274 @@
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from flask import Flask, Response, g, has_request_context, request
+
+# --- Admission Control ---
+# Requests are classified by path into pools, each with its own concurrency limit and a
+# bounded wait queue, so slow news searches cannot take every worker thread away from
+# cheap keystroke requests. A request finding its pool's queue full, or not admitted
+# within the pool's max wait, gets an immediate 503 with Retry-After. Admitted requests
+# carry a deadline (arrival + pool deadline) that upstream fetches check before starting
+# and while downloading, so work that can no longer be delivered in time is abandoned.
+
+ARRIVAL_ENVIRON_KEY = "scotbot.arrival"    # time.monotonic() at arrival, set by front-ends (asgi.py)
+ADMITTED_ENVIRON_KEY = "scotbot.admitted"  # Pool name when the front-end already admitted the request
+SERVICE_TIME_SMOOTHING = 0.2
+MAX_RETRY_AFTER = 60
+
+class Overloaded(Exception):
+    """The request's pool has no room; answer with 503 and retry_after"""
+
+    def __init__(self, pool: "RoutePool", retry_after: int):
+        super().__init__(f"{pool.name} pool overloaded")
+        self.pool = pool
+        self.retry_after = retry_after
+
+class DeadlineExceeded(TimeoutError):
+    """Too little of the request's time budget is left for an operation"""
+
+class RoutePool:
+    """Concurrency limit plus bounded FIFO-ish wait queue for one class of routes"""
+
+    def __init__(self, name: str, concurrency: int, queue_size: int, max_wait: float, deadline: float):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue_size = max(0, queue_size)
+        self.max_wait = max_wait
+        self.deadline = deadline
+        self.active = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.admitted = 0
+        self.shed = 0
+        self.queue_timeouts = 0
+        self.deadline_exceeded = 0
+        self.service_time = deadline / 4  # Smoothed seconds per admitted request, for Retry-After
+        self._cond = threading.Condition()
+        self._release_listeners: List[Callable[["RoutePool"], None]] = []
+
+    @classmethod
+    def from_env(cls, name: str, concurrency: int, queue_size: int, max_wait: float, deadline: float) -> "RoutePool":
+        """Defaults overridable by <NAME>_CONCURRENCY, <NAME>_QUEUE and <NAME>_DEADLINE"""
+        prefix = name.upper()
+        return cls(
+            name,
+            concurrency=int(os.environ.get(f"{prefix}_CONCURRENCY", concurrency)),
+            queue_size=int(os.environ.get(f"{prefix}_QUEUE", queue_size)),
+            max_wait=max_wait,
+            deadline=float(os.environ.get(f"{prefix}_DEADLINE", deadline)),
+        )
+
+    def try_acquire(self) -> bool:
+        """Take a slot without waiting; False if the caller must queue, Overloaded if it can't"""
+        with self._cond:
+            if self.active < self.concurrency and self.queued == 0:
+                self.active += 1
+                self.admitted += 1
+                return True
+            if self.queued >= self.queue_size:
+                self.shed += 1
+                raise Overloaded(self, self._retry_after())
+            return False
+
+    def acquire(self, arrived: float) -> None:
+        """Take a slot, queueing until arrived + max_wait; raises Overloaded when shed"""
+        with self._cond:
+            if self.active < self.concurrency and self.queued == 0:
+                self.active += 1
+                self.admitted += 1
+                return
+            if self.queued >= self.queue_size:
+                self.shed += 1
+                raise Overloaded(self, self._retry_after())
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+            give_up = arrived + self.max_wait
+            try:
+                while self.active >= self.concurrency:
+                    remaining = give_up - time.monotonic()
+                    if remaining <= 0:
+                        self.shed += 1
+                        self.queue_timeouts += 1
+                        raise Overloaded(self, self._retry_after())
+                    self._cond.wait(remaining)
+            finally:
+                self.queued -= 1
+            self.active += 1
+            self.admitted += 1
+
+    def acquire_now(self) -> None:
+        """Take a slot if one is free and nobody is queued for it, else raise Overloaded"""
+        with self._cond:
+            if self.active < self.concurrency and self.queued == 0:
+                self.active += 1
+                self.admitted += 1
+                return
+            self.shed += 1
+            raise Overloaded(self, self._retry_after())
+
+    # Queueing for front-ends that wait without a thread (asgi.py): enqueue() after try_acquire()
+    # returned False, then try_promote() when woken by a release, or leave_queue() on giving up.
+
+    def enqueue(self) -> None:
+        with self._cond:
+            if self.queued >= self.queue_size:
+                self.shed += 1
+                raise Overloaded(self, self._retry_after())
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+    def try_promote(self) -> bool:
+        """Move one queued request into a free slot; False if none is free"""
+        with self._cond:
+            if self.active >= self.concurrency:
+                return False
+            self.queued -= 1
+            self.active += 1
+            self.admitted += 1
+            return True
+
+    def leave_queue(self, timed_out: bool) -> Optional[Overloaded]:
+        """Drop a queued request; a timed-out one is counted as shed and gets the error to raise"""
+        with self._cond:
+            self.queued -= 1
+            if not timed_out:
+                return None
+            self.shed += 1
+            self.queue_timeouts += 1
+            return Overloaded(self, self._retry_after())
+
+    def reject(self) -> Overloaded:
+        """Count a request shed for a reason outside the pool (e.g. upstream saturation)"""
+        with self._cond:
+            self.shed += 1
+            return Overloaded(self, self._retry_after())
+
+    def release(self, service_time: float) -> None:
+        with self._cond:
+            self.active -= 1
+            self.service_time += SERVICE_TIME_SMOOTHING * (service_time - self.service_time)
+            self._cond.notify()
+        for listener in self._release_listeners:
+            listener(self)
+
+    def add_release_listener(self, listener: Callable[["RoutePool"], None]) -> None:
+        """Call listener(pool) after every release, from the releasing thread"""
+        self._release_listeners.append(listener)
+
+    def note_deadline_exceeded(self) -> None:
+        with self._cond:
+            self.deadline_exceeded += 1
+
+    def _retry_after(self) -> int:
+        # Time for the work ahead of a new arrival to drain through the pool's slots
+        backlog = (self.active + self.queued + 1) / self.concurrency
+        return max(1, min(MAX_RETRY_AFTER, math.ceil(backlog * self.service_time)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "concurrency": self.concurrency,
+                "queue_size": self.queue_size,
+                "deadline": self.deadline,
+                "active": self.active,
+                "queue_depth": self.queued,
+                "max_queue_depth": self.max_queued,
+                "admitted": self.admitted,
+                "shed": self.shed,
+                "queue_timeouts": self.queue_timeouts,
+                "deadline_exceeded": self.deadline_exceeded,
+                "service_time_ms": round(self.service_time * 1000, 1),
+            }
+
+class Scheduler:
+    """Admits requests into their route class's pool and tracks their deadlines"""
+
+    def __init__(self, pools: Iterable[RoutePool], classify: Callable[[str, Mapping[str, str]], Optional[str]],
+                 enabled: bool = True, leader_pools: Optional[Mapping[str, str]] = None):
+        self.pools = {pool.name: pool for pool in pools}
+        self.classify = classify
+        self.enabled = enabled
+        # Follower pool name -> pool whose slot a follower needs if it ends up doing the work itself
+        self.leader_pools = dict(leader_pools or {})
+
+    def pool_for(self, path: str, args: Mapping[str, str]) -> Optional[RoutePool]:
+        """None for unscheduled paths (metrics, profiling, static files)"""
+        if not self.enabled:
+            return None
+        name = self.classify(path, args)
+        return self.pools.get(name) if name else None
+
+    def before_request(self) -> Optional[Response]:
+        admitted_by = request.environ.get(ADMITTED_ENVIRON_KEY)
+        pool = self.pools.get(admitted_by) if admitted_by else self.pool_for(request.path, request.args)
+        if pool is None:
+            return None
+        arrived = request.environ.get(ARRIVAL_ENVIRON_KEY) or time.monotonic()
+        if not admitted_by:
+            try:
+                pool.acquire(arrived)
+            except Overloaded as e:
+                return shed_response(e.retry_after)
+            g.admission = (pool, time.monotonic())
+        g.deadline_pool = pool
+        g.deadline = arrived + pool.deadline
+        return None
+
+    def claim_leader_slot(self) -> None:
+        """For a request admitted as a follower that finds nothing to follow: take a slot in the
+        leader pool before doing the work, or raise Overloaded. A no-op for other requests."""
+        pool = g.get("deadline_pool") if has_request_context() else None
+        leader_pool = self.pools.get(self.leader_pools.get(pool.name, "")) if pool is not None else None
+        if leader_pool is None or "leader_admission" in g:
+            return
+        leader_pool.acquire_now()
+        g.leader_admission = (leader_pool, time.monotonic())
+
+    def teardown_request(self, exc: Optional[BaseException]) -> None:
+        for key in ("admission", "leader_admission"):
+            admission = g.pop(key, None)
+            if admission is not None:
+                pool, admitted_at = admission
+                pool.release(time.monotonic() - admitted_at)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "pools": {name: pool.stats() for name, pool in self.pools.items()}}
+
+def shed_response(retry_after: int) -> Response:
+    response = Response("Server busy, please retry shortly\n", status=503, mimetype="text/plain")
+    response.headers["Retry-After"] = str(retry_after)
+    return response
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current request's deadline; None outside scheduled requests"""
+    if not has_request_context():
+        return None
+    deadline = g.get("deadline")
+    return None if deadline is None else deadline - time.monotonic()
+
+def deadline_exceeded(message: str) -> DeadlineExceeded:
+    """Count an abandoned operation against the current request's pool and build the error to raise"""
+    pool = g.get("deadline_pool") if has_request_context() else None
+    if pool is not None:
+        pool.note_deadline_exceeded()
+    return DeadlineExceeded(message)
+
+def check_deadline(minimum: float) -> Optional[float]:
+    """Remaining budget if at least minimum seconds are left (None when unbounded), else raise"""
+    remaining = remaining_time()
+    if remaining is not None and remaining < minimum:
+        raise deadline_exceeded(f"Request deadline leaves {max(remaining, 0):.2f}s, need {minimum:.2f}s")
+    return remaining
+
+def init_scheduler(app: Flask, pools: Iterable[RoutePool], classify: Callable[[str, Mapping[str, str]], Optional[str]],
+                   enabled: bool = True, leader_pools: Optional[Mapping[str, str]] = None) -> Scheduler:
+    """Attach admission hooks to app; with enabled=False nothing is scheduled or shed"""
+    scheduler = Scheduler(pools, classify, enabled, leader_pools)
+    if enabled:
+        app.before_request(scheduler.before_request)
+        app.teardown_request(scheduler.teardown_request)
+    return scheduler
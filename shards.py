@@ -0,0 +1,53 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# --- League Shards ---
+# Entity data is partitioned by league (team-stats.sql `League`, joined on `Squad`).
+# Each alias lives in exactly one shard, so fanning a match out across the loaded
+# shards finds the same alias hits a single combined automaton would.
+
+OTHER_LEAGUE = "Other"  # Clubs without a row in team-stats.sql
+
+@dataclass
+class EntityShard:
+    league: str
+    player_aliases: Dict[str, List[str]] = field(default_factory=dict)
+    club_aliases: Dict[str, List[str]] = field(default_factory=dict)
+    player_automaton: Any = None
+    club_automaton: Any = None
+
+    def stats(self) -> Dict[str, Any]:
+        def automaton_bytes(automaton):
+            return automaton.get_stats()["total_size"] if automaton is not None else 0
+        return {
+            "league": self.league,
+            "player_aliases": len(self.player_aliases),
+            "club_aliases": len(self.club_aliases),
+            "automaton_bytes": automaton_bytes(self.player_automaton) + automaton_bytes(self.club_automaton),
+        }
+
+class ShardedAutomaton:
+    """Duck-types ahocorasick.Automaton.iter over several per-shard automata"""
+
+    def __init__(self, automata: Iterable[Any]):
+        self.automata = [a for a in automata if a is not None]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, Any]]:
+        for automaton in self.automata:
+            yield from automaton.iter(text)
+
+def parse_league_selection(raw: Optional[str]) -> Optional[Set[str]]:
+    """LEAGUE_SHARDS value ('Premier League,La Liga') to a set of leagues; None loads every shard"""
+    if not raw or not raw.strip():
+        return None
+    return {league.strip() for league in raw.split(",") if league.strip()}
+
+def partition_aliases(aliases: Dict[str, List[str]], league_of: Callable[[str], str],
+                      shards: Dict[str, EntityShard], kind: str) -> None:
+    """Assign each alias to the shard of its canonical (first) name"""
+    for norm_alias, canon_list in aliases.items():
+        league = league_of(canon_list[0])
+        shard = shards.get(league)
+        if shard is None:
+            shard = shards[league] = EntityShard(league)
+        getattr(shard, f"{kind}_aliases")[norm_alias] = canon_list
@@ -0,0 +1,73 @@
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# --- Request Coalescing ---
+class SingleFlightTimeout(TimeoutError):
+    """Raised to a waiter whose shared computation did not finish in time"""
+
+class SingleFlight:
+    """Run at most one computation per key at a time; concurrent callers share its outcome.
+
+    The first caller for a key (the leader) runs the function in its own thread; callers
+    arriving while it is in flight wait on the same Future and receive the same result or
+    exception. Nothing is cached once the computation completes.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None,
+           on_lead: Optional[Callable[[], None]] = None) -> Any:
+        """fn's result for key; on_lead() runs first when this caller leads, and may raise to refuse"""
+        with self._lock:
+            self.requests += 1
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if leader:
+            try:
+                if on_lead is not None:
+                    on_lead()
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+                with self._lock:
+                    self.errors += 1
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+            return future.result()
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise SingleFlightTimeout(f"Timed out after {timeout}s waiting for in-flight request") from None
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for key is running now, so a new caller would only wait on it"""
+        with self._lock:
+            return key in self._calls
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "in_flight": len(self._calls),
+                "coalescing_ratio": self.coalesced / self.requests if self.requests else 0.0,
+            }
@@ -0,0 +1,216 @@
+import heapq
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+# --- Rolling Trend Aggregates ---
+# Mention counts are kept per entity and per (player, club) pair in fixed hourly
+# ring buffers. Decayed scores use forward decay: each mention adds
+# exp(lambda * (published - landmark)), so the relative order of keys never changes
+# as time passes and a single maintained heap can serve the top-k without rescoring.
+
+HOUR = 3600
+DEFAULT_RING_HOURS = 7 * 24
+DEFAULT_HALF_LIFE_HOURS = 6
+DEFAULT_VELOCITY_HOURS = 6
+MAX_SEEN_LINKS = 100_000
+# Rebase the landmark before exp() gets anywhere near float overflow
+MAX_FORWARD_EXPONENT = 500.0
+# Series with nothing left in their ring and a score below this are dropped (a lone
+# mention falls under it after ~10 half-lives); sweeps run at most once per interval
+NEGLIGIBLE_SCORE = 1e-3
+PRUNE_INTERVAL = HOUR
+
+@dataclass
+class TrendStats:
+    key: Hashable
+    mentions_24h: int
+    mentions_total: int
+    score: float
+    velocity: float
+
+class HourlyRing:
+    """Fixed-size ring of per-hour counts ending at the most recent hour seen"""
+    __slots__ = ("counts", "head")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.head = -1  # absolute hour number of the newest slot
+
+    def add(self, hour: int, n: int = 1) -> None:
+        size = len(self.counts)
+        if hour > self.head:
+            for h in range(max(self.head + 1, hour - size + 1), hour + 1):
+                self.counts[h % size] = 0
+            self.head = hour
+        if self.head - hour < size:
+            self.counts[hour % size] += n
+
+    def window_sum(self, end_hour: int, hours: int) -> int:
+        """Sum of the `hours` slots ending at end_hour (inclusive)"""
+        size = len(self.counts)
+        first = max(end_hour - hours + 1, self.head - size + 1)
+        last = min(end_hour, self.head)
+        return sum(self.counts[h % size] for h in range(first, last + 1))
+
+class _TrendSeries:
+    __slots__ = ("ring", "forward", "total")
+
+    def __init__(self, ring_hours: int):
+        self.ring = HourlyRing(ring_hours)
+        self.forward = 0.0
+        self.total = 0
+
+class _TopK:
+    """Lazy max-heap over forward scores; stale entries are skipped and periodically purged"""
+
+    def __init__(self):
+        self.heap: List[Tuple[float, int, Hashable]] = []
+        self.current: Dict[Hashable, float] = {}
+        self._counter = 0
+
+    def update(self, key: Hashable, forward: float) -> None:
+        self.current[key] = forward
+        self._counter += 1
+        heapq.heappush(self.heap, (-forward, self._counter, key))
+        if len(self.heap) > 4 * len(self.current) + 1024:
+            self.rebuild()
+
+    def discard(self, key: Hashable) -> None:
+        """Forget key; its heap entries become stale and are skipped"""
+        self.current.pop(key, None)
+
+    def rebuild(self) -> None:
+        self.heap = [(-score, i, key) for i, (key, score) in enumerate(self.current.items())]
+        self._counter = len(self.heap)
+        heapq.heapify(self.heap)
+
+    def top(self, k: int) -> List[Hashable]:
+        keys: List[Hashable] = []
+        valid: List[Tuple[float, int, Hashable]] = []
+        while self.heap and len(keys) < k:
+            entry = heapq.heappop(self.heap)
+            neg, _, key = entry
+            if self.current.get(key) == -neg and key not in keys:
+                keys.append(key)
+                valid.append(entry)
+        for entry in valid:
+            heapq.heappush(self.heap, entry)
+        return keys
+
+class TrendAggregator:
+    """Ingest-time aggregation of mention counts, decayed scores and velocity"""
+
+    def __init__(self, ring_hours: int = DEFAULT_RING_HOURS, half_life_hours: float = DEFAULT_HALF_LIFE_HOURS,
+                 velocity_hours: int = DEFAULT_VELOCITY_HOURS):
+        self.ring_hours = ring_hours
+        self.velocity_hours = velocity_hours
+        self.decay_rate = math.log(2) / (half_life_hours * HOUR)
+        self.landmark = time.time()
+        self._series: Dict[str, Dict[Hashable, _TrendSeries]] = {"player": {}, "team": {}, "pair": {}}
+        self._top: Dict[str, _TopK] = {kind: _TopK() for kind in self._series}
+        self._seen_links: "OrderedDict[str, None]" = OrderedDict()
+        self._last_prune = time.time()
+        self._lock = threading.Lock()
+
+    def ingest(self, articles: Iterable) -> int:
+        """Record entity-annotated articles (objects with link/published/players/teams); returns how many were new"""
+        recorded = 0
+        with self._lock:
+            for article in articles:
+                if article.link in self._seen_links:
+                    continue
+                self._seen_links[article.link] = None
+                if len(self._seen_links) > MAX_SEEN_LINKS:
+                    self._seen_links.popitem(last=False)
+                self._record(article.published, article.players or [], article.teams or [])
+                recorded += 1
+            self._maybe_prune(time.time())
+        return recorded
+
+    def _record(self, published: float, players: List[str], teams: List[str]) -> None:
+        if self.decay_rate * (published - self.landmark) > MAX_FORWARD_EXPONENT:
+            self._rebase(published)
+        weight = math.exp(self.decay_rate * (published - self.landmark))
+        hour = int(published // HOUR)
+        keys = [("player", p) for p in players] + [("team", t) for t in teams]
+        keys += [("pair", (p, t)) for p in players for t in teams]
+        for kind, key in keys:
+            series = self._series[kind].get(key)
+            if series is None:
+                series = self._series[kind][key] = _TrendSeries(self.ring_hours)
+            series.ring.add(hour)
+            series.forward += weight
+            series.total += 1
+            self._top[kind].update(key, series.forward)
+
+    def _rebase(self, new_landmark: float) -> None:
+        factor = math.exp(-self.decay_rate * (new_landmark - self.landmark))
+        for kind, series_map in self._series.items():
+            for series in series_map.values():
+                series.forward *= factor
+            self._top[kind].current = {key: s.forward for key, s in series_map.items()}
+            self._top[kind].rebuild()
+        self.landmark = new_landmark
+
+    def _decayed(self, series: _TrendSeries, now: float) -> float:
+        return series.forward * math.exp(-self.decay_rate * (now - self.landmark))
+
+    def _maybe_prune(self, now: float) -> None:
+        if now - self._last_prune >= PRUNE_INTERVAL:
+            self._prune(now)
+
+    def _prune(self, now: float) -> int:
+        """Drop series with no mentions left in their ring and a negligible score"""
+        hour = int(now // HOUR)
+        removed = 0
+        for kind, series_map in self._series.items():
+            dead = [key for key, series in series_map.items()
+                    if self._decayed(series, now) < NEGLIGIBLE_SCORE
+                    and series.ring.window_sum(hour, self.ring_hours) == 0]
+            for key in dead:
+                del series_map[key]
+                self._top[kind].discard(key)
+            if dead:
+                self._top[kind].rebuild()
+            removed += len(dead)
+        self._last_prune = now
+        return removed
+
+    def prune(self, now: Optional[float] = None) -> int:
+        with self._lock:
+            return self._prune(time.time() if now is None else now)
+
+    def _stats(self, kind: str, key: Hashable, now: float) -> Optional[TrendStats]:
+        series = self._series[kind].get(key)
+        if series is None:
+            return None
+        hour = int(now // HOUR)
+        recent = series.ring.window_sum(hour, self.velocity_hours)
+        previous = series.ring.window_sum(hour - self.velocity_hours, self.velocity_hours)
+        return TrendStats(
+            key=key,
+            mentions_24h=series.ring.window_sum(hour, 24),
+            mentions_total=series.total,
+            score=self._decayed(series, now),
+            velocity=(recent - previous) / self.velocity_hours,
+        )
+
+    def stats(self, kind: str, key: Hashable, now: Optional[float] = None) -> Optional[TrendStats]:
+        with self._lock:
+            return self._stats(kind, key, time.time() if now is None else now)
+
+    def score(self, kind: str, key: Hashable, now: Optional[float] = None) -> float:
+        stats = self.stats(kind, key, now)
+        return stats.score if stats else 0.0
+
+    def top(self, kind: str, k: int = 10, now: Optional[float] = None) -> List[TrendStats]:
+        """Hottest keys of a kind ('player', 'team' or 'pair') by decayed score; negligible ones are left out"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._maybe_prune(now)
+            ranked = [self._stats(kind, key, now) for key in self._top[kind].top(k)]
+        return [stats for stats in ranked if stats.score >= NEGLIGIBLE_SCORE]